@@ -24,7 +24,7 @@ from energy import (
     MiningScheduler,
     StrategyOptimizer,
     UtilityRateService,
-    ENERGY_COMPANY_PRESETS
+    get_energy_company_presets
 )
 from thermal import ThermalManager
 from alerts import AlertManager
@@ -81,6 +81,24 @@ def validate_color(color: str, default: str = '#3498db') -> str:
     return default
 
 
+def round_projected_cost(cost_details: Dict) -> Dict:
+    """Round projected daily cost values for JSON display"""
+    rounded = dict(cost_details)
+    for key in ('total_cost', 'total_kwh'):
+        rounded[key] = round(cost_details[key], 4)
+    for key in ('cost_by_rate_type', 'kwh_by_rate_type'):
+        rounded[key] = {k: round(v, 4) for k, v in cost_details[key].items()}
+    rounded['rates_by_type'] = {
+        k: round(v, 4) if v else None for k, v in cost_details['rates_by_type'].items()
+    }
+    rounded['hourly_breakdown'] = [
+        {**h, 'power_watts': round(h['power_watts'], 1),
+         'kwh': round(h['kwh'], 4), 'cost': round(h['cost'], 4)}
+        for h in cost_details['hourly_breakdown']
+    ]
+    return rounded
+
+
 def redact_pool_secrets(pools: List[Dict]) -> List[Dict]:
     """Redact pool credential fields from API responses."""
     redacted = []
@@ -638,7 +656,8 @@ class FleetManager:
             if energy_data['total_kwh'] > 0:
                 # Match rates to actual timestamps (not current rate)
                 cost_data = self.energy_rate_mgr.calculate_cost_with_tou(
-                    energy_data['hourly_breakdown']
+                    energy_data['hourly_breakdown'],
+                    include_details=False
                 )
 
                 # Calculate average power from energy consumed
@@ -2009,6 +2028,7 @@ def energy_config():
                 rate_structure=data.get('rate_structure', 'tou'),
                 currency=data.get('currency', 'USD')
             )
+            fleet.energy_rate_mgr.invalidate_cache()
             return jsonify({
                 'success': True,
                 'message': 'Energy configuration saved'
@@ -2039,8 +2059,9 @@ def energy_rates():
             # Check if using preset
             if 'preset' in data:
                 preset_name = data['preset']
-                if preset_name in ENERGY_COMPANY_PRESETS:
-                    preset = ENERGY_COMPANY_PRESETS[preset_name]
+                presets = get_energy_company_presets()
+                if preset_name in presets:
+                    preset = presets[preset_name]
                     fleet.energy_rate_mgr.set_tou_rates(preset['rates'])
                     # Calculate average rate from preset for default fallback
                     preset_rates = [r['rate_per_kwh'] for r in preset['rates']]
@@ -2050,6 +2071,7 @@ def energy_rates():
                         energy_company=preset_name,
                         default_rate=avg_rate
                     )
+                    fleet.energy_rate_mgr.invalidate_cache()
                     return jsonify({
                         'success': True,
                         'message': f'Applied {preset_name} rate preset'
@@ -2076,6 +2098,7 @@ def energy_rates():
     else:  # DELETE
         try:
             fleet.db.delete_all_energy_rates()
+            fleet.energy_rate_mgr.invalidate_cache()
             return jsonify({
                 'success': True,
                 'message': 'All energy rates deleted'
@@ -2155,6 +2178,7 @@ def set_custom_energy_rates():
             energy_company='Custom (Manual Entry)',
             default_rate=standard_rate
         )
+        fleet.energy_rate_mgr.invalidate_cache()
 
         return jsonify({
             'success': True,
@@ -2175,7 +2199,7 @@ def energy_presets():
     """Get available energy company presets"""
     return jsonify({
         'success': True,
-        'presets': list(ENERGY_COMPANY_PRESETS.keys())
+        'presets': list(get_energy_company_presets().keys())
     })
 
 
@@ -2414,6 +2438,7 @@ def apply_openei_rate(rate_label):
                 energy_company=result.get('plan_name', ''),
                 default_rate=avg_rate
             )
+            fleet.energy_rate_mgr.invalidate_cache()
 
         return jsonify({
             'success': True,
@@ -2528,6 +2553,7 @@ def set_manual_rates():
                 energy_company=utility_name,
                 default_rate=avg_rate
             )
+            fleet.energy_rate_mgr.invalidate_cache()
 
             return jsonify({
                 'success': True,
@@ -2581,6 +2607,7 @@ def set_manual_rates():
             energy_company=utility_name,
             default_rate=avg_rate
         )
+        fleet.energy_rate_mgr.invalidate_cache()
 
         return jsonify({
             'success': True,
@@ -2823,7 +2850,7 @@ def get_projected_daily_cost():
 
         return jsonify({
             'success': True,
-            'projected_cost': cost_details
+            'projected_cost': round_projected_cost(cost_details)
         })
     except Exception as e:
         logger.error(f"Error calculating projected cost: {e}")
@@ -4553,6 +4580,7 @@ def set_seasonal_rates():
                     rate.get('rate_type', 'standard'),
                     season
                 ))
+        fleet.energy_rate_mgr.invalidate_cache()
 
         return jsonify({'success': True, 'message': f'Rates saved for {season} season'})
     except Exception as e:
@@ -4591,3 +4619,4 @@ if __name__ == '__main__':
     finally:
         if fleet is not None:
             fleet.stop_monitoring()
+            fleet.detector.shutdown()
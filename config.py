@@ -36,6 +36,8 @@ DEBUG = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
 BITAXE_API_TIMEOUT = 2
 CGMINER_API_TIMEOUT = 2
 CGMINER_PORT = 4028
+# Keep full CGMiner summary/devs responses under status['raw'] (debugging only)
+INCLUDE_RAW_MINER_RESPONSES = os.environ.get('INCLUDE_RAW_MINER_RESPONSES', 'false').lower() == 'true'
 
 # Supported miner types
 MINER_TYPES = {
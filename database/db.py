@@ -4,6 +4,7 @@ SQLite database operations for fleet manager
 import sqlite3
 import logging
 import math
+import queue
 import threading
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
@@ -49,15 +50,57 @@ def _parse_numeric(value) -> Optional[float]:
 class Database:
     """Handle all database operations"""
 
+    # Idle connections kept for reuse; matches the gunicorn thread count
+    POOL_SIZE = 4
+
     def __init__(self, db_path: str):
         self.db_path = db_path
         self._write_lock = threading.Lock()
+        self._pool = queue.LifoQueue(maxsize=self.POOL_SIZE)
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        # Pooled connections move between threads, but only one uses each at a time.
+        # The statement cache has room for every query in this module, so
+        # long-lived pooled connections don't re-prepare evicted SQL.
+        conn = sqlite3.connect(
+            self.db_path, timeout=10, check_same_thread=False, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        # Per-connection settings, applied once when the pool opens the connection.
+        # synchronous=NORMAL is safe with WAL and avoids an fsync per commit on SD
+        # cards; temp_store keeps GROUP BY/ORDER BY scratch b-trees off the card.
+        conn.executescript("""
+            PRAGMA foreign_keys=ON;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+        """)
+        return conn
+
+    def _release_connection(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, or close it if the pool is full"""
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        """Close all idle pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
     @contextmanager
     def _get_connection(self, readonly: bool = False):
         """Context manager for database connections.
 
+        Connections are reused from a small pool rather than opened per call.
+
         Args:
             readonly: If True, skip acquiring write lock (for SELECT-only queries).
         """
@@ -66,19 +109,23 @@ class Database:
             self._write_lock.acquire()
             lock_acquired = True
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10)
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys=ON")
-            conn.execute("PRAGMA journal_mode=WAL")
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
             try:
                 yield conn
                 conn.commit()
             except Exception as e:
-                conn.rollback()
+                try:
+                    conn.rollback()
+                finally:
+                    # Don't hand a connection in an unknown state to the next caller
+                    conn.close()
                 logger.error(f"Database error: {e}")
                 raise
-            finally:
-                conn.close()
+            else:
+                self._release_connection(conn)
         finally:
             if lock_acquired:
                 self._write_lock.release()
@@ -88,6 +135,9 @@ class Database:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # WAL is stored in the database file, so it only needs setting once
+            cursor.execute("PRAGMA journal_mode=WAL")
+
             # Miners table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS miners (
@@ -135,6 +185,46 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_stats_timestamp
                 ON stats(timestamp)
             """)
+            # Latest-row-per-miner lookups seek this index instead of sorting, and
+            # per-miner share deltas over a time range read it without touching
+            # the table (supersedes the narrower idx_stats_miner_timestamp)
+            cursor.execute("DROP INDEX IF EXISTS idx_stats_miner_timestamp")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_stats_miner_timestamp_shares
+                ON stats(miner_id, timestamp, shares_accepted)
+            """)
+
+            # Running min/max of cumulative shares per miner, kept current by a
+            # trigger so all-time totals don't rescan the whole stats table
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'miner_share_totals'"
+            )
+            backfill_share_totals = cursor.fetchone() is None
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS miner_share_totals (
+                    miner_id INTEGER PRIMARY KEY,
+                    min_shares INTEGER NOT NULL,
+                    max_shares INTEGER NOT NULL
+                )
+            """)
+            if backfill_share_totals:
+                cursor.execute("""
+                    INSERT INTO miner_share_totals (miner_id, min_shares, max_shares)
+                    SELECT miner_id, MIN(COALESCE(shares_accepted, 0)), MAX(COALESCE(shares_accepted, 0))
+                    FROM stats
+                    GROUP BY miner_id
+                """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_stats_share_totals
+                AFTER INSERT ON stats
+                BEGIN
+                    INSERT INTO miner_share_totals (miner_id, min_shares, max_shares)
+                    VALUES (NEW.miner_id, COALESCE(NEW.shares_accepted, 0), COALESCE(NEW.shares_accepted, 0))
+                    ON CONFLICT(miner_id) DO UPDATE SET
+                        min_shares = MIN(min_shares, excluded.min_shares),
+                        max_shares = MAX(max_shares, excluded.max_shares);
+                END
+            """)
 
             # Energy configuration table
             cursor.execute("""
@@ -392,6 +482,10 @@ class Database:
                 logger.info("Adding custom_name column to miners table")
                 cursor.execute("ALTER TABLE miners ADD COLUMN custom_name TEXT")
 
+            # Refresh planner statistics where stale so range queries on stats pick
+            # the timestamp indexes; a no-op when nothing has changed much
+            cursor.execute("PRAGMA optimize")
+
             logger.info("Database initialized successfully")
 
     def add_miner(self, ip: str, miner_type: str, model: str = None) -> int:
@@ -464,6 +558,28 @@ class Database:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    def get_latest_stats_by_ip(self) -> Dict[str, Dict]:
+        """
+        Get the latest stats row for every miner that has one, keyed by miner IP.
+
+        Rows also carry the miner's custom_name and are ordered by IP, so callers
+        that only need miners with stats can skip get_all_miners().
+        """
+        with self._get_connection(readonly=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT m.ip, m.custom_name, s.*
+                FROM miners m
+                JOIN stats s ON s.id = (
+                    SELECT id FROM stats
+                    WHERE miner_id = m.id
+                    ORDER BY timestamp DESC
+                    LIMIT 1
+                )
+                ORDER BY m.ip
+            """)
+            return {row['ip']: dict(row) for row in cursor.fetchall()}
+
     def get_historical_stats(self, miner_id: int, limit: int = 100) -> List[Dict]:
         """Get historical stats for a miner"""
         with self._get_connection(readonly=True) as conn:
@@ -561,6 +677,7 @@ class Database:
                 cursor.execute("DELETE FROM pool_earnings WHERE miner_ip = ?", (ip,))
                 # Delete stats
                 cursor.execute("DELETE FROM stats WHERE miner_id = ?", (miner_id,))
+                cursor.execute("DELETE FROM miner_share_totals WHERE miner_id = ?", (miner_id,))
                 # Delete miner
                 cursor.execute("DELETE FROM miners WHERE id = ?", (miner_id,))
                 logger.info(f"Deleted miner {ip}")
@@ -633,6 +750,19 @@ class Database:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
+    def add_energy_rates(self, rates: List[Dict]):
+        """Add multiple energy rates in one transaction"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO energy_rates (day_of_week, start_time, end_time, rate_per_kwh, rate_type, season)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (rate.get('day_of_week'), rate['start_time'], rate['end_time'], rate['rate_per_kwh'],
+                 rate.get('rate_type', 'standard'), rate.get('season', 'all'))
+                for rate in rates
+            ])
+
     def delete_all_energy_rates(self):
         """Clear all energy rates"""
         with self._get_connection() as conn:
@@ -649,6 +779,19 @@ class Database:
                 VALUES (?, ?, ?, ?, ?)
             """, (day_of_week, start_time, end_time, target_frequency, enabled))
 
+    def add_mining_schedules(self, schedules: List[Dict]):
+        """Add multiple mining schedule entries in one transaction"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO mining_schedule (day_of_week, start_time, end_time, target_frequency, enabled)
+                VALUES (?, ?, ?, ?, ?)
+            """, [
+                (schedule.get('day_of_week'), schedule['start_time'], schedule['end_time'],
+                 schedule['target_frequency'], schedule.get('enabled', 1))
+                for schedule in schedules
+            ])
+
     def get_mining_schedules(self) -> List[Dict]:
         """Get all mining schedules"""
         with self._get_connection(readonly=True) as conn:
@@ -663,6 +806,12 @@ class Database:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM mining_schedule WHERE id = ?", (schedule_id,))
 
+    def delete_active_mining_schedules(self):
+        """Delete all enabled mining schedules"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM mining_schedule WHERE enabled = 1")
+
     def add_energy_consumption(self, total_power_watts: float, energy_kwh: float,
                               cost: float, current_rate: float):
         """Log energy consumption"""
@@ -1188,9 +1337,19 @@ class Database:
                        stratum_password: str = 'x', fee_percent: float = 2.0,
                        pool_type: str = 'FPPS', pool_difficulty: float = None):
         """Add or update pool configuration for a miner"""
+        self.add_pool_configs([{
+            'miner_ip': miner_ip, 'pool_index': pool_index, 'pool_name': pool_name,
+            'pool_url': pool_url, 'pool_port': pool_port, 'stratum_user': stratum_user,
+            'stratum_password': stratum_password, 'fee_percent': fee_percent,
+            'pool_type': pool_type, 'pool_difficulty': pool_difficulty,
+        }])
+
+    def add_pool_configs(self, configs: List[Dict]):
+        """Add or update several pool configurations in one transaction (keys as add_pool_config's args)"""
+        now = datetime.now()
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.executemany("""
                 INSERT INTO pool_config (
                     miner_ip, pool_index, pool_name, pool_url, pool_port,
                     stratum_user, stratum_password, fee_percent, pool_type,
@@ -1206,9 +1365,13 @@ class Database:
                     pool_type = excluded.pool_type,
                     pool_difficulty = excluded.pool_difficulty,
                     last_updated = excluded.last_updated
-            """, (miner_ip, pool_index, pool_name, pool_url, pool_port,
-                  stratum_user, stratum_password, fee_percent, pool_type,
-                  pool_difficulty, datetime.now()))
+            """, [
+                (cfg['miner_ip'], cfg['pool_index'], cfg['pool_name'], cfg['pool_url'],
+                 cfg.get('pool_port', 3333), cfg.get('stratum_user'), cfg.get('stratum_password', 'x'),
+                 cfg.get('fee_percent', 2.0), cfg.get('pool_type', 'FPPS'), cfg.get('pool_difficulty'),
+                 now)
+                for cfg in configs
+            ])
 
     def get_pool_config(self, miner_ip: str = None, pool_name: str = None) -> List[Dict]:
         """Get pool configuration(s)"""
@@ -1251,6 +1414,20 @@ class Database:
                 WHERE miner_ip = ? AND pool_index = ?
             """, (pool_difficulty, datetime.now(), miner_ip, pool_index))
 
+    def update_pool_difficulties(self, updates: List[Dict]):
+        """Update several pool difficulties in one transaction (dicts with miner_ip, pool_index, pool_difficulty)"""
+        now = datetime.now()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                UPDATE pool_config
+                SET pool_difficulty = ?, last_updated = ?
+                WHERE miner_ip = ? AND pool_index = ?
+            """, [
+                (update['pool_difficulty'], now, update['miner_ip'], update['pool_index'])
+                for update in updates
+            ])
+
     def add_pool_earnings(self, miner_ip: str, pool_name: str, earned_sats: int = 0,
                          shares_accepted: int = 0, shares_rejected: int = 0,
                          pool_difficulty: float = None, estimated_sats: int = 0,
@@ -1356,6 +1533,62 @@ class Database:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    def get_historical_rates(self, timestamps: List[datetime]) -> Dict[datetime, Optional[Dict]]:
+        """Batch version of get_historical_rate for many timestamps.
+
+        Loads the relevant history rows and the current rates in one connection
+        and matches them in Python with the same rules as get_historical_rate.
+        """
+        if not timestamps:
+            return {}
+
+        min_date = min(timestamps).strftime('%Y-%m-%d')
+        max_date = max(timestamps).strftime('%Y-%m-%d')
+
+        with self._get_connection(readonly=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT erh.*, er.day_of_week, er.start_time, er.end_time
+                FROM energy_rates_history erh
+                JOIN energy_rates er ON erh.rate_id = er.id
+                WHERE erh.effective_date <= ?
+                AND (erh.end_date IS NULL OR erh.end_date >= ?)
+                ORDER BY erh.effective_date DESC
+            """, (max_date, min_date))
+            history = [dict(row) for row in cursor.fetchall()]
+
+            cursor.execute("SELECT * FROM energy_rates ORDER BY id DESC")
+            current = [dict(row) for row in cursor.fetchall()]
+
+        def _covers(rate, day_of_week, time_str):
+            return ((rate['day_of_week'] is None or rate['day_of_week'] == day_of_week)
+                    and rate['start_time'] <= time_str and rate['end_time'] > time_str)
+
+        results = {}
+        # Date string and weekday name per calendar date; timestamps span few dates
+        day_keys = {}
+        for timestamp in set(timestamps):
+            day_key = day_keys.get(timestamp.date())
+            if day_key is None:
+                day_key = day_keys[timestamp.date()] = (
+                    timestamp.strftime('%Y-%m-%d'), timestamp.strftime('%A')
+                )
+            date_str, day_of_week = day_key
+            time_str = f"{timestamp.hour:02d}:{timestamp.minute:02d}:{timestamp.second:02d}"
+
+            match = next((
+                row for row in history
+                if row['effective_date'] <= date_str
+                and (row['end_date'] is None or row['end_date'] >= date_str)
+                and _covers(row, day_of_week, time_str)
+            ), None)
+            if match is None:
+                # Fallback to current energy_rates table
+                match = next((row for row in current if _covers(row, day_of_week, time_str)), None)
+            results[timestamp] = match
+
+        return results
+
     def get_energy_rate_history(self, rate_id: int = None,
                                start_date: str = None, end_date: str = None) -> List[Dict]:
         """Get energy rate history entries"""
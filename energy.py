@@ -6,12 +6,52 @@ and automated frequency control based on time-of-use pricing.
 """
 import requests
 import logging
+import time
 from datetime import datetime, time as dt_time
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import config
 
+try:
+    import orjson  # Optional: faster JSON parsing for API responses
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Expected hashes per share at difficulty 1 (2^32), and seconds in a day
+_TWO_32 = 4294967296.0
+_SECONDS_PER_DAY = 86400.0
+
+# Power model: power = base_power + variable_power * freq_ratio
+# Base power is typically 20-30% of max (for fans, controller, etc)
+# Variable power scales with frequency
+_BASE_POWER_RATIO = 0.25  # 25% base power when running
+
+
+def _power_at_frequency(max_power_watts: float, target_frequency: int, max_frequency: int) -> float:
+    """Estimated power in watts at a frequency (see calculate_power_at_frequency)"""
+    if target_frequency <= 0:
+        return 0  # Miners off
+
+    if target_frequency >= max_frequency or max_frequency <= 0:
+        return max_power_watts  # Full power
+
+    freq_ratio = target_frequency / max_frequency
+    return max_power_watts * (_BASE_POWER_RATIO + (1 - _BASE_POWER_RATIO) * freq_ratio)
+
+
+def _estimate_at_frequency(freq: int, max_freq: int, max_hashrate_hs: float,
+                           max_power_watts: float) -> Tuple[float, float]:
+    """Estimate (hashrate, power) at a given frequency"""
+    if freq <= 0:
+        return 0, 0
+    freq_ratio = min(freq / max_freq, 1.0) if max_freq > 0 else 1.0
+    return max_hashrate_hs * freq_ratio, _power_at_frequency(max_power_watts, freq, max_freq)
+
 
 class UtilityRateService:
     """
@@ -84,10 +124,10 @@ class UtilityRateService:
             # Expand brand names to subsidiary names for OpenEI lookups.
             # OpenEI uses legal subsidiary names (e.g. "Northern States Power Co")
             # rather than brand names (e.g. "Xcel Energy").
-            subsidiary_names = BRAND_TO_SUBSIDIARIES.get(query_lower, [])
-            subsidiary_names_lower = [s.lower() for s in subsidiary_names]
+            subsidiary_names = BRAND_TO_SUBSIDIARIES.get(query_lower, ())
+            subsidiary_names_lower = _BRAND_TO_SUBSIDIARIES_LOWER.get(query_lower, ())
             if subsidiary_names:
-                logger.info(f"Brand '{query}' expanded to {len(subsidiary_names)} subsidiaries: {subsidiary_names}")
+                logger.info(f"Brand '{query}' expanded to {len(subsidiary_names)} subsidiaries: {list(subsidiary_names)}")
 
             # Strategy 1: Fetch utility companies list and filter locally.
             # The /utility_companies endpoint only supports version 'latest' (up to v3),
@@ -168,7 +208,7 @@ class UtilityRateService:
 
             # Strategy 2: Search the rates endpoint with ratesforutility
             # Search for the original query, plus each subsidiary name if brand was expanded
-            rate_search_terms = [query] + subsidiary_names
+            rate_search_terms = [query, *subsidiary_names]
             for search_term in rate_search_terms:
                 if len(utilities) >= limit:
                     break
@@ -741,9 +781,10 @@ class BitcoinDataFetcher:
                 'epoch': 4
             }
 
-        epoch = self.get_halving_epoch(block_height)
-        current_subsidy = self.get_block_subsidy(block_height)
-        blocks_until_halving = self.get_blocks_until_halving(block_height)
+        # One divmod covers epoch, subsidy and distance to the next halving
+        epoch, blocks_into_epoch = divmod(block_height, self.HALVING_INTERVAL)
+        current_subsidy = self.INITIAL_SUBSIDY / (2 ** epoch)
+        blocks_until_halving = self.HALVING_INTERVAL - blocks_into_epoch
         next_subsidy = current_subsidy / 2
 
         # Estimate time until halving (average 10 min per block)
@@ -781,7 +822,8 @@ class ProfitabilityCalculator:
         self.default_pool_fee_percent = 2.0
         # NOTE: tx_fee_multiplier removed - use pool-specific calculations instead
         # FPPS+ pools like Braiins include tx fees in their fee structure
-        # Cache for block subsidy (updated when block height is fetched)
+        # Cache for block subsidy, keyed by halving epoch (updated when block height is fetched)
+        self._cached_epoch = None
         self._cached_block_subsidy = None
 
     def get_block_subsidy(self) -> float:
@@ -789,13 +831,17 @@ class ProfitabilityCalculator:
         Get current block subsidy based on block height.
         Automatically adjusts when halvings occur.
         """
-        # Get fresh subsidy from btc_fetcher (which caches block height)
-        subsidy = self.btc_fetcher.get_block_subsidy()
-        if subsidy is not None:
-            if self._cached_block_subsidy != subsidy:
-                logger.info(f"Block subsidy: {subsidy} BTC")
-                self._cached_block_subsidy = subsidy
-            return subsidy
+        # Get fresh epoch from btc_fetcher (which caches block height)
+        epoch = self.btc_fetcher.get_halving_epoch()
+        if epoch is not None:
+            if self._cached_epoch != epoch:
+                self._cached_epoch = epoch
+                self._cached_block_subsidy = self.btc_fetcher.get_block_subsidy(
+                    epoch * self.btc_fetcher.HALVING_INTERVAL
+                )
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Block subsidy: {self._cached_block_subsidy} BTC")
+            return self._cached_block_subsidy
 
         # Fallback to cached value or default (epoch 4 = 3.125 BTC)
         return self._cached_block_subsidy or 3.125
@@ -832,7 +878,7 @@ class ProfitabilityCalculator:
         # This is equivalent to: your_share_of_network * daily_btc_mined
         # where daily_btc_mined ≈ 144 blocks * block_subsidy
         hashrate_hs = hashrate_th * 1e12  # Convert TH/s to H/s
-        btc_per_day = (hashrate_hs * 86400 * block_subsidy) / (difficulty * 2**32)
+        btc_per_day = (hashrate_hs * _SECONDS_PER_DAY * block_subsidy) / (difficulty * _TWO_32)
 
         # Apply pool fee if specified or auto-detected
         if pool_fee_percent is None and self.pool_manager:
@@ -901,7 +947,7 @@ class ProfitabilityCalculator:
         )
         response = requests.get(url, timeout=8)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content) if orjson else response.json()
 
         if 'blockChanceText' not in data:
             return None
@@ -997,13 +1043,13 @@ class ProfitabilityCalculator:
             if difficulty is None:
                 return {'error': 'Unable to fetch network difficulty'}
 
-        two_32 = difficulty * (2**32)
+        two_32 = difficulty * _TWO_32
 
         chance_per_block = (hashrate_hs * 600) / two_32
         chance_per_block_odds = int(1 / chance_per_block) if chance_per_block > 0 else float('inf')
         chance_per_hour = (hashrate_hs * 3600) / two_32
         chance_per_hour_odds = int(1 / chance_per_hour) if chance_per_hour > 0 else float('inf')
-        chance_per_day = (hashrate_hs * 86400) / two_32
+        chance_per_day = (hashrate_hs * _SECONDS_PER_DAY) / two_32
         chance_per_day_odds = int(1 / chance_per_day) if chance_per_day > 0 else float('inf')
         chance_per_week = (hashrate_hs * 604800) / two_32
         chance_per_week_odds = max(1, int(1 / chance_per_week)) if chance_per_week > 0 else float('inf')
@@ -1064,21 +1110,7 @@ class ProfitabilityCalculator:
         Returns:
             Estimated power consumption in watts
         """
-        if target_frequency <= 0:
-            return 0  # Miners off
-
-        if target_frequency >= max_frequency or max_frequency <= 0:
-            return max_power_watts  # Full power
-
-        # Power model: power = base_power + variable_power * freq_ratio
-        # Base power is typically 20-30% of max (for fans, controller, etc)
-        # Variable power scales with frequency
-        BASE_POWER_RATIO = 0.25  # 25% base power when running
-
-        freq_ratio = target_frequency / max_frequency
-        power = max_power_watts * (BASE_POWER_RATIO + (1 - BASE_POWER_RATIO) * freq_ratio)
-
-        return power
+        return _power_at_frequency(max_power_watts, target_frequency, max_frequency)
 
     def calculate_projected_daily_cost(self, max_power_watts: float,
                                        rate_manager: 'EnergyRateManager',
@@ -1099,7 +1131,8 @@ class ProfitabilityCalculator:
             day_of_week: Day to calculate for (default: today)
 
         Returns:
-            Dict with total cost, breakdown by hour, and summary stats
+            Dict with total cost, breakdown by hour, and summary stats.
+            Values are unrounded; callers round for display.
         """
         if day_of_week is None:
             day_of_week = datetime.now().strftime("%A")
@@ -1108,6 +1141,18 @@ class ProfitabilityCalculator:
         hourly_schedules = mining_scheduler.get_24h_schedule(day_of_week)
         hourly_rates = rate_manager.get_24h_rates(day_of_week)
 
+        # Scheduled off all day: every hour costs nothing, skip the power math
+        if all(s['target_frequency'] == 0 and s['schedule_id'] is not None
+               for s in hourly_schedules):
+            return self._zero_daily_cost(day_of_week, max_power_watts, hourly_rates)
+
+        return self._daily_cost_breakdown(day_of_week, max_power_watts, hourly_schedules,
+                                          hourly_rates, max_frequency)
+
+    def _daily_cost_breakdown(self, day_of_week: str, max_power_watts: float,
+                              hourly_schedules: List[Dict], hourly_rates: List[Dict],
+                              max_frequency: int) -> Dict:
+        """Projected daily cost from each hour's schedule and rate."""
         # Calculate cost for each hour
         hourly_breakdown = []
         total_cost = 0
@@ -1144,9 +1189,7 @@ class ProfitabilityCalculator:
                 hours_full_power += 1
                 mining_status = 'full'
             else:
-                power_watts = self.calculate_power_at_frequency(
-                    max_power_watts, target_freq, max_frequency
-                )
+                power_watts = _power_at_frequency(max_power_watts, target_freq, max_frequency)
                 hours_reduced += 1
                 mining_status = 'reduced'
 
@@ -1165,23 +1208,24 @@ class ProfitabilityCalculator:
                 if rates_by_type[rate_type] is None:
                     rates_by_type[rate_type] = rate
 
+            # Raw floats here; rounding is a display concern handled at the API boundary
             hourly_breakdown.append({
                 'hour': hour,
-                'power_watts': round(power_watts, 1),
-                'kwh': round(kwh, 4),
+                'power_watts': power_watts,
+                'kwh': kwh,
                 'rate': rate,
                 'rate_type': rate_type,
-                'cost': round(cost, 4),
+                'cost': cost,
                 'target_frequency': target_freq,
                 'mining_status': mining_status
             })
 
         return {
-            'total_cost': round(total_cost, 4),
-            'total_kwh': round(total_kwh, 4),
-            'cost_by_rate_type': {k: round(v, 4) for k, v in cost_by_rate_type.items()},
-            'kwh_by_rate_type': {k: round(v, 4) for k, v in kwh_by_rate_type.items()},
-            'rates_by_type': {k: round(v, 4) if v else None for k, v in rates_by_type.items()},  # Actual $/kWh rates
+            'total_cost': total_cost,
+            'total_kwh': total_kwh,
+            'cost_by_rate_type': cost_by_rate_type,
+            'kwh_by_rate_type': kwh_by_rate_type,
+            'rates_by_type': rates_by_type,  # Actual $/kWh rates
             'hours_full_power': hours_full_power,
             'hours_reduced': hours_reduced,
             'hours_off': hours_off,
@@ -1190,6 +1234,47 @@ class ProfitabilityCalculator:
             'hourly_breakdown': hourly_breakdown
         }
 
+    def _zero_daily_cost(self, day_of_week: str, max_power_watts: float,
+                         hourly_rates: List[Dict]) -> Dict:
+        """Projected daily cost for a day scheduled off every hour.
+
+        Same result as _daily_cost_breakdown, which the dashboard relies on for
+        the rate labels and hourly rows.
+        """
+        cost_by_rate_type = {'peak': 0, 'off-peak': 0, 'standard': 0}
+        kwh_by_rate_type = {'peak': 0, 'off-peak': 0, 'standard': 0}
+        rates_by_type = {'peak': None, 'off-peak': None, 'standard': None}
+        hourly_breakdown = []
+
+        for hour, rate_info in enumerate(hourly_rates):
+            rate_type = rate_info['rate_type']
+            if rate_type in rates_by_type and rates_by_type[rate_type] is None:
+                rates_by_type[rate_type] = rate_info['rate']
+            hourly_breakdown.append({
+                'hour': hour,
+                'power_watts': 0,
+                'kwh': 0.0,
+                'rate': rate_info['rate'],
+                'rate_type': rate_type,
+                'cost': 0.0,
+                'target_frequency': 0,
+                'mining_status': 'off'
+            })
+
+        return {
+            'total_cost': 0.0,
+            'total_kwh': 0.0,
+            'cost_by_rate_type': cost_by_rate_type,
+            'kwh_by_rate_type': kwh_by_rate_type,
+            'rates_by_type': rates_by_type,
+            'hours_full_power': 0,
+            'hours_reduced': 0,
+            'hours_off': 24,
+            'day_of_week': day_of_week,
+            'max_power_watts': max_power_watts,
+            'hourly_breakdown': hourly_breakdown
+        }
+
     def calculate_profitability(self, total_hashrate: float, total_power_watts: float,
                                energy_rate_per_kwh: float, btc_price: float = None,
                                difficulty: float = None, pool_fee_percent: float = None,
@@ -1231,7 +1316,7 @@ class ProfitabilityCalculator:
         # For display purposes, calculate gross (what would be earned solo)
         block_subsidy = self.get_block_subsidy()
         hashrate_hs = hashrate_th * 1e12
-        btc_per_day_gross = (hashrate_hs * 86400 * block_subsidy) / (difficulty * 2**32)
+        btc_per_day_gross = (hashrate_hs * _SECONDS_PER_DAY * block_subsidy) / (difficulty * _TWO_32)
 
         # Pool detection is handled by app.py's get_profitability() which passes
         # the detected fee via pool_fee_percent. Here we just apply defaults.
@@ -1317,10 +1402,11 @@ class ProfitabilityCalculator:
 
         # Add detailed energy cost breakdown if available
         if energy_cost_details:
+            rates_by_type = energy_cost_details.get('rates_by_type', {})
             result['energy_cost_details'] = {
-                'cost_by_rate_type': energy_cost_details['cost_by_rate_type'],
-                'kwh_by_rate_type': energy_cost_details['kwh_by_rate_type'],
-                'rates_by_type': energy_cost_details.get('rates_by_type', {}),  # Actual $/kWh rates
+                'cost_by_rate_type': {k: round(v, 4) for k, v in energy_cost_details['cost_by_rate_type'].items()},
+                'kwh_by_rate_type': {k: round(v, 4) for k, v in energy_cost_details['kwh_by_rate_type'].items()},
+                'rates_by_type': {k: round(v, 4) if v else None for k, v in rates_by_type.items()},  # Actual $/kWh rates
                 'hours_full_power': energy_cost_details['hours_full_power'],
                 'hours_reduced': energy_cost_details['hours_reduced'],
                 'hours_off': energy_cost_details['hours_off'],
@@ -1335,39 +1421,157 @@ class ProfitabilityCalculator:
         return result
 
 
+# Day names in datetime.weekday() order, for (weekday, hour) lookup tables
+_DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_DAY_INDEX = {name: i for i, name in enumerate(_DAY_NAMES)}
+
+_MINUTES_PER_DAY = 1440
+
+
+def _to_minutes(hhmm: str, is_end: bool = False) -> int:
+    """
+    Convert "HH:MM" to minutes since midnight.
+    As an end time, "23:59" means end of day and maps to 1440.
+    Raises ValueError for malformed times.
+    """
+    if is_end and hhmm == "23:59":
+        return _MINUTES_PER_DAY
+    hours, minutes = hhmm.split(':')
+    hours, minutes = int(hours), int(minutes)
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid time: {hhmm!r}")
+    return hours * 60 + minutes
+
+
+def _minute_in_range(minute: int, start: int, end: int) -> bool:
+    """
+    Check if a minute of day falls in [start, end), wrapping past midnight
+    when end < start. Bounds come from _to_minutes.
+    """
+    span = end - start if end >= start else end - start + _MINUTES_PER_DAY
+    return (minute - start) % _MINUTES_PER_DAY < span
+
+
+def _time_windows(rows: List[Dict]) -> List[Tuple[Dict, int, int]]:
+    """Pair rate/schedule rows with their start/end minutes, skipping malformed times"""
+    windows = []
+    for row in rows:
+        try:
+            windows.append((row, _to_minutes(row['start_time']),
+                            _to_minutes(row['end_time'], is_end=True)))
+        except (ValueError, AttributeError) as e:
+            logger.error(f"Error checking time range: {e}")
+    return windows
+
+
+class _RateWindow(NamedTuple):
+    """A cached energy_rates row reduced to the fields rate lookups read"""
+    day_of_week: Optional[str]
+    start: int
+    end: int
+    rate_per_kwh: float
+    rate_type: str
+
+
 class EnergyRateManager:
     """Manage time-of-use energy rates"""
 
     def __init__(self, db):
         self.db = db
-
-    def get_current_rate(self) -> float:
-        """Get current energy rate based on time of day"""
-        now = datetime.now()
-        current_time = now.strftime("%H:%M")
-        current_day = now.strftime("%A")  # Monday, Tuesday, etc.
-
-        rates = self.db.get_energy_rates()
-
-        # Find matching rate for current time
-        for rate in rates:
+        # Rates and config are read on every lookup but change rarely, so keep
+        # them in memory. Writers call invalidate_cache(); the TTL covers any
+        # writes that bypass this class.
+        self._rates_cache = None
+        self._config_cache = None
+        self._cache_time = 0.0
+        self.cache_duration = 60  # seconds
+        # _RateWindow for each cached rate with valid times
+        self._rate_windows = []
+        # (rate, rate_type, source) for each weekday*1440 + minute slot, rebuilt with the cache
+        self._rate_lut = None
+        # (rate, rate_type, source) when no TOU rates apply, so every lookup is the default
+        self._default_slot = None
+
+    def _load_cache(self):
+        """Reload rates and config from the database if stale"""
+        now = time.monotonic()
+        if self._rates_cache is None or now - self._cache_time >= self.cache_duration:
+            rates = self.db.get_energy_rates()
+            config_data = self.db.get_energy_config()
+            windows = [
+                _RateWindow(rate['day_of_week'], start, end,
+                            rate['rate_per_kwh'], rate.get('rate_type', 'standard'))
+                for rate, start, end in _time_windows(rates)
+            ]
+            default = self._default_rate_slot(config_data)
+            rate_lut = self._build_rate_lut(windows, default)
+            # Lookups run on Flask and monitor threads without a lock, so publish
+            # only complete tables, and mark the cache fresh last
+            self._config_cache = config_data
+            self._rate_windows = windows
+            self._rate_lut = rate_lut
+            self._default_slot = None if windows else default
+            self._rates_cache = rates
+            self._cache_time = now
+
+    @staticmethod
+    def _build_rate_lut(windows: List[_RateWindow], default: Tuple[float, str, str]) -> List[Tuple[float, str, str]]:
+        """Resolve the rate for every minute of the week once per cache load"""
+        rate_lut = []
+        for day_name in _DAY_NAMES:
+            day_lut = [default] * _MINUTES_PER_DAY
+            # Paint windows last to first so the first matching rate wins, as in _scan_rates
+            for window in reversed(windows):
+                if window.day_of_week and window.day_of_week != day_name:
+                    continue
+                slot = (window.rate_per_kwh, window.rate_type, 'schedule')
+                start, end = window.start, window.end
+                if end >= start:
+                    day_lut[start:end] = [slot] * (end - start)
+                else:
+                    day_lut[start:] = [slot] * (_MINUTES_PER_DAY - start)
+                    day_lut[:end] = [slot] * end
+            rate_lut.extend(day_lut)
+        return rate_lut
+
+    @staticmethod
+    def _default_rate_slot(config_data: Optional[Dict]) -> Tuple[float, str, str]:
+        """(rate, rate_type, source) used when no TOU rate covers a time"""
+        default_rate = (config_data.get('default_rate') if config_data else None) or 0.12
+        return default_rate, 'standard', 'default'
+
+    def _scan_rates(self, day_name: str, minute: int) -> Tuple[float, str, str]:
+        """Find (rate, rate_type, source) for a day and minute of day by scanning cached rates"""
+        for window in self._rate_windows:
             # Check if day matches (if specified)
-            if rate['day_of_week'] and rate['day_of_week'] != current_day:
+            if window.day_of_week and window.day_of_week != day_name:
                 continue
 
-            # Check if time is in range
-            start = rate['start_time']
-            end = rate['end_time']
+            if _minute_in_range(minute, window.start, window.end):
+                return window.rate_per_kwh, window.rate_type, 'schedule'
 
-            if self._time_in_range(current_time, start, end):
-                return rate['rate_per_kwh']
+        # Default rate if no match
+        return self._default_rate_slot(self._config_cache)
 
-        # Return default rate if no match
-        config_data = self.db.get_energy_config()
-        if config_data and 'default_rate' in config_data:
-            return config_data['default_rate']
+    def _rate_slot(self, day_name: str, hour: int, minute: int = 0) -> Tuple[float, str, str]:
+        """Get (rate, rate_type, source) in effect at a day/hour/minute"""
+        self._load_cache()
+        default_slot = self._default_slot
+        if default_slot is not None:
+            return default_slot
+        day_index = _DAY_INDEX.get(day_name)
+        if day_index is not None:
+            return self._rate_lut[day_index * _MINUTES_PER_DAY + hour * 60 + minute]
+        return self._scan_rates(day_name, hour * 60 + minute)
 
-        return 0.12  # Default fallback rate (US average)
+    def invalidate_cache(self):
+        """Mark cached rates/config stale so the next lookup re-reads the database"""
+        # Expire rather than clear, so concurrent lookups keep using the old tables
+        self._cache_time = float('-inf')
+
+    def get_current_rate(self) -> float:
+        """Get current energy rate based on time of day"""
+        return self.get_rate_for_timestamp(datetime.now())
 
     def _time_in_range(self, current: str, start: str, end: str) -> bool:
         """
@@ -1376,28 +1580,10 @@ class EnergyRateManager:
         This prevents boundary overlap issues where 14:00 would match both "00:00-14:00" and "14:00-19:00".
         """
         try:
-            current_dt = datetime.strptime(current, "%H:%M").time()
-            start_dt = datetime.strptime(start, "%H:%M").time()
-            end_dt = datetime.strptime(end, "%H:%M").time()
-
-            # Special case: 23:59 means "end of day" so include it
-            end_is_eod = (end == "23:59")
-
-            if start_dt <= end_dt:
-                # Normal range (e.g., 09:00 to 17:00)
-                # Start is inclusive, end is exclusive (unless end of day)
-                if end_is_eod:
-                    return start_dt <= current_dt <= end_dt
-                else:
-                    return start_dt <= current_dt < end_dt
-            else:
-                # Range crosses midnight (e.g., 22:00 to 06:00)
-                # Start is inclusive, end is exclusive
-                if end_is_eod:
-                    return current_dt >= start_dt or current_dt <= end_dt
-                else:
-                    return current_dt >= start_dt or current_dt < end_dt
-        except Exception as e:
+            return _minute_in_range(
+                _to_minutes(current), _to_minutes(start), _to_minutes(end, is_end=True)
+            )
+        except (ValueError, AttributeError) as e:
             logger.error(f"Error checking time range: {e}")
             return False
 
@@ -1419,17 +1605,11 @@ class EnergyRateManager:
         """
         # Clear existing rates
         self.db.delete_all_energy_rates()
+        self.invalidate_cache()
 
         # Add new rates
-        for rate in rates:
-            self.db.add_energy_rate(
-                start_time=rate['start_time'],
-                end_time=rate['end_time'],
-                rate_per_kwh=rate['rate_per_kwh'],
-                day_of_week=rate.get('day_of_week'),
-                rate_type=rate.get('rate_type', 'standard'),
-                season=rate.get('season', 'all')
-            )
+        self.db.add_energy_rates(rates)
+        self.invalidate_cache()
 
     def get_rate_for_timestamp(self, timestamp: datetime) -> float:
         """
@@ -1441,25 +1621,8 @@ class EnergyRateManager:
         Returns:
             Rate in $/kWh
         """
-        time_str = timestamp.strftime("%H:%M")
-        day_name = timestamp.strftime("%A")  # Monday, Tuesday, etc.
-
-        rates = self.db.get_energy_rates()
-
-        for rate in rates:
-            # Check if day matches (if specified)
-            if rate['day_of_week'] and rate['day_of_week'] != day_name:
-                continue
-
-            if self._time_in_range(time_str, rate['start_time'], rate['end_time']):
-                return rate['rate_per_kwh']
-
-        # Return default rate if no match
-        config_data = self.db.get_energy_config()
-        if config_data and config_data.get('default_rate'):
-            return config_data['default_rate']
-
-        return 0.12  # Default fallback
+        day_name = _DAY_NAMES[timestamp.weekday()]
+        return self._rate_slot(day_name, timestamp.hour, timestamp.minute)[0]
 
     def get_rate_info_for_hour(self, hour: int, day_of_week: str = None) -> Dict:
         """
@@ -1475,28 +1638,11 @@ class EnergyRateManager:
         if day_of_week is None:
             day_of_week = datetime.now().strftime("%A")
 
-        time_str = f"{hour:02d}:00"
-        rates = self.db.get_energy_rates()
-
-        for rate in rates:
-            if rate['day_of_week'] and rate['day_of_week'] != day_of_week:
-                continue
-
-            if self._time_in_range(time_str, rate['start_time'], rate['end_time']):
-                return {
-                    'rate': rate['rate_per_kwh'],
-                    'rate_type': rate.get('rate_type', 'standard'),
-                    'source': 'schedule'
-                }
-
-        # Default rate
-        config_data = self.db.get_energy_config()
-        default_rate = config_data.get('default_rate', 0.12) if config_data else 0.12
-
+        rate, rate_type, source = self._rate_slot(day_of_week, hour)
         return {
-            'rate': default_rate,
-            'rate_type': 'standard',
-            'source': 'default'
+            'rate': rate,
+            'rate_type': rate_type,
+            'source': source
         }
 
     def get_24h_rates(self, day_of_week: str = None) -> List[Dict]:
@@ -1509,12 +1655,24 @@ class EnergyRateManager:
         if day_of_week is None:
             day_of_week = datetime.now().strftime("%A")
 
+        day_index = _DAY_INDEX.get(day_of_week)
+        if day_index is None:
+            # Unknown day name: resolve each hour individually
+            return [
+                {'hour': hour, **self.get_rate_info_for_hour(hour, day_of_week)}
+                for hour in range(24)
+            ]
+
+        self._load_cache()
+        day_start = day_index * _MINUTES_PER_DAY
+        day_slots = self._rate_lut[day_start:day_start + _MINUTES_PER_DAY:60]
         return [
-            {'hour': hour, **self.get_rate_info_for_hour(hour, day_of_week)}
-            for hour in range(24)
+            {'hour': hour, 'rate': rate, 'rate_type': rate_type, 'source': source}
+            for hour, (rate, rate_type, source) in enumerate(day_slots)
         ]
 
-    def calculate_cost_with_tou(self, hourly_breakdown: List[Dict], use_historical: bool = True) -> Dict:
+    def calculate_cost_with_tou(self, hourly_breakdown: List[Dict], use_historical: bool = True,
+                                include_details: bool = True) -> Dict:
         """
         Calculate energy cost using actual TOU rates for each hour.
         Uses historical rates from energy_rates_history if available.
@@ -1522,6 +1680,8 @@ class EnergyRateManager:
         Args:
             hourly_breakdown: List of {'hour': '2024-01-19 14:00', 'kwh': 0.5, 'readings': 10}
             use_historical: If True, attempts to use historical rates for accuracy
+            include_details: If False, skip building the per-hour detailed_breakdown
+                (returned as an empty list) when only totals are needed
 
         Returns:
             Dict with total_cost, breakdown by rate type, weighted_avg_rate, and details
@@ -1530,49 +1690,52 @@ class EnergyRateManager:
         cost_by_rate_type = {'peak': 0, 'off-peak': 0, 'standard': 0}
         kwh_by_rate_type = {'peak': 0, 'off-peak': 0, 'standard': 0}
         detailed_breakdown = []
+        # (midnight datetime, first minute of that weekday in the rate table) per
+        # 'YYYY-MM-DD' prefix; breakdowns span only a few dates
+        dates = {}
 
-        rates = self.db.get_energy_rates()
-
+        parsed = []
         for entry in hourly_breakdown:
             hour_str = entry['hour']  # Format: '2024-01-19 14:00'
-            kwh = entry['kwh']
 
+            # Fixed-width format, so slice instead of strptime
             try:
-                hour_dt = datetime.strptime(hour_str, '%Y-%m-%d %H:%M')
+                date_info = dates.get(hour_str[:10])
+                if date_info is None:
+                    date_dt = datetime(int(hour_str[0:4]), int(hour_str[5:7]), int(hour_str[8:10]))
+                    date_info = dates[hour_str[:10]] = (date_dt, date_dt.weekday() * _MINUTES_PER_DAY)
+                date_dt, day_offset = date_info
+                hour, minute = int(hour_str[11:13]), int(hour_str[14:16])
+                hour_dt = date_dt.replace(hour=hour, minute=minute)
             except ValueError:
                 continue
+            parsed.append((hour_str, entry['kwh'], hour_dt, day_offset + hour * 60 + minute))
+
+        # Resolve every historical rate in one database round trip. History rows
+        # hang off energy_rates, so with no TOU rates there is nothing to find.
+        self._load_cache()
+        historical_rates = {}
+        if use_historical and self._rates_cache:
+            historical_rates = self.db.get_historical_rates([p[2] for p in parsed])
 
+        rate_lut = self._rate_lut
+        for hour_str, kwh, hour_dt, week_minute in parsed:
             # Try to get historical rate first if enabled
             rate = None
             rate_type = 'standard'
             rate_source = 'current'
 
-            if use_historical:
-                historical_rate_data = self.db.get_historical_rate(hour_dt)
-                if historical_rate_data:
-                    rate = historical_rate_data.get('rate_per_kwh')
-                    rate_type = historical_rate_data.get('rate_type', 'standard')
-                    rate_source = 'historical'
+            historical_rate_data = historical_rates.get(hour_dt)
+            if historical_rate_data:
+                rate = historical_rate_data.get('rate_per_kwh')
+                rate_type = historical_rate_data.get('rate_type', 'standard')
+                rate_source = 'historical'
 
-            # Fallback to current rates if no historical rate found
+            # Fallback to current rates (or the default rate) if no historical rate found
             if rate is None:
-                time_str = hour_dt.strftime("%H:%M")
-                day_name = hour_dt.strftime("%A")
-
-                for r in rates:
-                    if r['day_of_week'] and r['day_of_week'] != day_name:
-                        continue
-                    if self._time_in_range(time_str, r['start_time'], r['end_time']):
-                        rate = r['rate_per_kwh']
-                        rate_type = r.get('rate_type', 'standard')
-                        break
-
-            # Final fallback to default rate
-            if rate is None:
-                config_data = self.db.get_energy_config()
-                rate = config_data.get('default_rate', 0.12) if config_data else 0.12
-                rate_type = 'standard'
-                rate_source = 'default'
+                rate, rate_type, source = rate_lut[week_minute]
+                if source == 'default':
+                    rate_source = 'default'
 
             # Calculate cost for this hour
             cost = kwh * rate
@@ -1583,14 +1746,15 @@ class EnergyRateManager:
                 cost_by_rate_type[rate_type] += cost
                 kwh_by_rate_type[rate_type] += kwh
 
-            detailed_breakdown.append({
-                'hour': hour_str,
-                'kwh': kwh,
-                'rate': rate,
-                'rate_type': rate_type,
-                'rate_source': rate_source,
-                'cost': cost
-            })
+            if include_details:
+                detailed_breakdown.append({
+                    'hour': hour_str,
+                    'kwh': kwh,
+                    'rate': rate,
+                    'rate_type': rate_type,
+                    'rate_source': rate_source,
+                    'cost': cost
+                })
 
         # Calculate weighted average rate
         total_kwh = sum(kwh_by_rate_type.values())
@@ -1628,24 +1792,28 @@ class MiningScheduler:
         if day_of_week is None:
             day_of_week = datetime.now().strftime("%A")
 
-        time_str = f"{hour:02d}:00"
-        schedules = self.db.get_mining_schedules()
+        windows = _time_windows(self.db.get_mining_schedules())
+        return self._match_schedule(windows, day_of_week, hour * 60)
 
-        for schedule in schedules:
+    def _match_schedule(self, windows: List[Tuple[Dict, int, int]], day_of_week: str,
+                        minute: int) -> Optional[Dict]:
+        """Find the first schedule window covering a day and minute of day"""
+        for schedule, start, end in windows:
             # Check if day matches
             if schedule['day_of_week'] and schedule['day_of_week'] != day_of_week:
                 continue
 
             # Check if time is in range
-            if self.rate_manager._time_in_range(
-                time_str,
-                schedule['start_time'],
-                schedule['end_time']
-            ):
+            if _minute_in_range(minute, start, end):
                 return schedule
 
         return None  # No schedule = full power mining
 
+    def _get_day_schedules(self, day_of_week: str) -> List[Optional[Dict]]:
+        """Resolve the schedule for each of the 24 hours with a single database read"""
+        windows = _time_windows(self.db.get_mining_schedules())
+        return [self._match_schedule(windows, day_of_week, hour * 60) for hour in range(24)]
+
     def get_24h_schedule(self, day_of_week: str = None) -> List[Dict]:
         """
         Get the schedule for all 24 hours of a day.
@@ -1657,8 +1825,7 @@ class MiningScheduler:
             day_of_week = datetime.now().strftime("%A")
 
         hourly_schedule = []
-        for hour in range(24):
-            schedule = self.get_schedule_for_hour(hour, day_of_week)
+        for hour, schedule in enumerate(self._get_day_schedules(day_of_week)):
             if schedule:
                 hourly_schedule.append({
                     'hour': hour,
@@ -1677,14 +1844,18 @@ class MiningScheduler:
 
         return hourly_schedule
 
-    def check_profitability_gate(self, total_hashrate_hs: float, total_power_watts: float) -> Tuple[bool, Dict]:
+    def check_profitability_gate(self, total_hashrate_hs: float, total_power_watts: float,
+                                 btc_price: float = None, difficulty: float = None) -> Tuple[bool, Dict]:
         """Check if mining revenue exceeds energy cost at current rate.
+        btc_price/difficulty are fetched if not provided.
         Returns (is_profitable, margin_details)"""
         if not self.btc_fetcher or not self.profitability_calc:
             return True, {'reason': 'profitability_calc_unavailable'}
 
-        btc_price = self.btc_fetcher.get_btc_price()
-        difficulty = self.btc_fetcher.get_network_difficulty()
+        if btc_price is None:
+            btc_price = self.btc_fetcher.get_btc_price()
+        if difficulty is None:
+            difficulty = self.btc_fetcher.get_network_difficulty()
         if not btc_price or not difficulty:
             return True, {'reason': 'market_data_unavailable'}
 
@@ -1706,10 +1877,10 @@ class MiningScheduler:
             'energy_rate': energy_rate
         }
 
-    def check_btc_price_floor(self) -> Tuple[bool, float, float]:
+    def check_btc_price_floor(self, btc_price: float = None) -> Tuple[bool, float, float]:
         """Check if BTC price is above user-configured floor.
+        btc_price is fetched if not provided.
         Returns (above_floor, current_price, floor_price)"""
-        import json
         floor_setting = self.db.get_setting('btc_price_floor')
         floor_price = float(floor_setting) if floor_setting else 0
 
@@ -1719,7 +1890,9 @@ class MiningScheduler:
         if not self.btc_fetcher:
             return True, 0, floor_price
 
-        current_price = self.btc_fetcher.get_btc_price() or 0
+        if btc_price is None:
+            btc_price = self.btc_fetcher.get_btc_price()
+        current_price = btc_price or 0
         return current_price >= floor_price, current_price, floor_price
 
     def check_difficulty_change(self) -> Tuple[bool, Dict]:
@@ -1770,7 +1943,6 @@ class MiningScheduler:
             Tuple of (should_mine, target_frequency, reason_string)
         """
         # Gate 1: BTC price floor
-        import json
         auto_controls_raw = self.db.get_setting('profitability_auto_pause')
         profitability_auto_pause = auto_controls_raw == 'true' or auto_controls_raw == '1'
 
@@ -1778,9 +1950,11 @@ class MiningScheduler:
         if not above_floor and floor_price > 0:
             return False, 0, f"BTC price ${current_price:,.0f} below floor ${floor_price:,.0f}"
 
-        # Gate 2: Profitability gate
+        # Gate 2: Profitability gate (reuses the price fetched for gate 1, if any)
         if profitability_auto_pause and total_hashrate_hs > 0 and total_power_watts > 0:
-            is_profitable, margin = self.check_profitability_gate(total_hashrate_hs, total_power_watts)
+            is_profitable, margin = self.check_profitability_gate(
+                total_hashrate_hs, total_power_watts, btc_price=current_price or None
+            )
             if not is_profitable:
                 return False, 0, f"Unprofitable: ${margin.get('profit_per_day', 0):.4f}/day"
 
@@ -1791,22 +1965,14 @@ class MiningScheduler:
             return True, 0, "No schedule configured"
 
         now = datetime.now()
-        current_time = now.strftime("%H:%M")
-        current_day = now.strftime("%A")
-
-        for schedule in schedules:
-            if schedule['day_of_week'] and schedule['day_of_week'] != current_day:
-                continue
-
-            if self.rate_manager._time_in_range(
-                current_time,
-                schedule['start_time'],
-                schedule['end_time']
-            ):
-                target_freq = schedule['target_frequency']
-                should_mine = target_freq > 0
-                reason = f"Schedule: freq={target_freq}" if should_mine else "Schedule: mining paused"
-                return should_mine, target_freq, reason
+        schedule = self._match_schedule(
+            _time_windows(schedules), _DAY_NAMES[now.weekday()], now.hour * 60 + now.minute
+        )
+        if schedule:
+            target_freq = schedule['target_frequency']
+            should_mine = target_freq > 0
+            reason = f"Schedule: freq={target_freq}" if should_mine else "Schedule: mining paused"
+            return should_mine, target_freq, reason
 
         return True, 0, "Default: full power"
 
@@ -1818,9 +1984,10 @@ class MiningScheduler:
         current_hour = datetime.now().hour
         hourly_data = []
 
-        for hour in range(24):
-            schedule = self.get_schedule_for_hour(hour, day_of_week)
-            rate_info = self.rate_manager.get_rate_info_for_hour(hour, day_of_week)
+        day_schedules = self._get_day_schedules(day_of_week)
+        day_rates = self.rate_manager.get_24h_rates(day_of_week)
+
+        for hour, (schedule, rate_info) in enumerate(zip(day_schedules, day_rates)):
 
             if schedule:
                 target_freq = schedule['target_frequency']
@@ -1858,20 +2025,19 @@ class MiningScheduler:
         rates = self.rate_manager.get_rate_schedule()
 
         # Clear existing schedules
-        for schedule in self.db.get_mining_schedules():
-            self.db.delete_mining_schedule(schedule['id'])
+        self.db.delete_active_mining_schedules()
 
         # Create schedules based on rates
-        for rate in rates:
-            target_freq = low_frequency if rate['rate_per_kwh'] > max_rate_threshold else high_frequency
-
-            self.db.add_mining_schedule(
-                start_time=rate['start_time'],
-                end_time=rate['end_time'],
-                target_frequency=target_freq,
-                day_of_week=rate.get('day_of_week'),
-                enabled=1
-            )
+        self.db.add_mining_schedules([
+            {
+                'start_time': rate['start_time'],
+                'end_time': rate['end_time'],
+                'target_frequency': low_frequency if rate['rate_per_kwh'] > max_rate_threshold else high_frequency,
+                'day_of_week': rate.get('day_of_week'),
+                'enabled': 1
+            }
+            for rate in rates
+        ])
 
         logger.info(f"Created {len(rates)} schedule entries from rate data")
 
@@ -1887,16 +2053,6 @@ class StrategyOptimizer:
         self.rate_manager = rate_manager
         self.mining_scheduler = mining_scheduler
 
-    def _estimate_at_frequency(self, freq: int, max_freq: int, max_hashrate_hs: float,
-                                max_power_watts: float) -> Tuple[float, float]:
-        """Estimate hashrate and power at a given frequency."""
-        if freq <= 0:
-            return 0, 0
-        freq_ratio = min(freq / max_freq, 1.0) if max_freq > 0 else 1.0
-        hashrate = max_hashrate_hs * freq_ratio
-        power = self.profitability_calc.calculate_power_at_frequency(max_power_watts, freq, max_freq)
-        return hashrate, power
-
     def generate_strategies(self, fleet_hashrate_hs: float, fleet_power_watts: float,
                             min_frequency: int, max_frequency: int) -> List[Dict]:
         """Generate 3 personalized strategies based on real data."""
@@ -1911,24 +2067,46 @@ class StrategyOptimizer:
         freq_step = max(10, (max_frequency - min_frequency) // 20) if max_frequency > min_frequency else 10
         strategies = []
 
+        # USD earned per hour per H/s; everything but hashrate is fixed for this run
+        revenue_coef = 3600 * block_subsidy * btc_price / (difficulty * _TWO_32)
+
         # === Strategy 1: Maximum Profit ===
+        # Hashrate and power per candidate frequency are the same every hour,
+        # so estimate them once and only re-price energy cost per hour
+        candidates = [
+            (freq, *_estimate_at_frequency(freq, max_frequency, fleet_hashrate_hs, fleet_power_watts))
+            for freq in range(min_frequency, max_frequency + 1, freq_step)
+        ]
+
         max_profit_plan = []
+        # Running totals of the rounded hourly figures, passed to _build_strategy
+        tot_rev = tot_cost = 0
+        mining_hours = 0
+        # The winning frequency depends only on the rate, and a TOU day has just
+        # a few distinct rates, so sweep the candidates once per rate
+        best_by_rate = {}
         for hour_info in rates_24h:
             hour = hour_info['hour']
             rate = hour_info['rate']
-            best_freq = 0
-            best_profit = float('-inf')
-
-            for freq in range(min_frequency, max_frequency + 1, freq_step):
-                hr_hs, hr_power = self._estimate_at_frequency(freq, max_frequency, fleet_hashrate_hs, fleet_power_watts)
-                hr_th = hr_hs / 1e12
-                revenue = (hr_hs * 3600 * block_subsidy) / (difficulty * (2**32)) * btc_price
-                cost = (hr_power / 1000) * rate
-                profit = revenue - cost
-
-                if profit > best_profit:
-                    best_profit = profit
-                    best_freq = freq
+            best = best_by_rate.get(rate)
+            if best is None:
+                best_freq = 0
+                best_profit = float('-inf')
+                best_revenue = best_cost = 0
+
+                for freq, hr_hs, hr_power in candidates:
+                    revenue = hr_hs * revenue_coef
+                    cost = hr_power * 0.001 * rate
+                    profit = revenue - cost
+
+                    if profit > best_profit:
+                        best_profit = profit
+                        best_freq = freq
+                        best_revenue = revenue
+                        best_cost = cost
+
+                best = best_by_rate[rate] = (best_freq, best_profit, best_revenue, best_cost)
+            best_freq, best_profit, best_revenue, best_cost = best
 
             # If all unprofitable, turn off
             if best_profit < 0:
@@ -1937,37 +2115,49 @@ class StrategyOptimizer:
                     'revenue': 0, 'cost': 0, 'rate': rate
                 })
             else:
-                hr_hs, hr_power = self._estimate_at_frequency(best_freq, max_frequency, fleet_hashrate_hs, fleet_power_watts)
-                revenue = (hr_hs * 3600 * block_subsidy) / (difficulty * (2**32)) * btc_price
-                cost = (hr_power / 1000) * rate
+                revenue = round(best_revenue, 6)
+                cost = round(best_cost, 6)
                 max_profit_plan.append({
                     'hour': hour, 'frequency': best_freq,
-                    'profit': round(revenue - cost, 6), 'revenue': round(revenue, 6),
-                    'cost': round(cost, 6), 'rate': rate
+                    'profit': round(best_revenue - best_cost, 6), 'revenue': revenue,
+                    'cost': cost, 'rate': rate
                 })
+                tot_rev += revenue
+                tot_cost += cost
+                mining_hours += best_freq > 0
 
-        strategies.append(self._build_strategy('Maximum Profit', max_profit_plan, btc_price))
+        strategies.append(self._build_strategy('Maximum Profit', max_profit_plan, btc_price,
+                                               tot_rev, tot_cost, mining_hours))
 
         # === Strategy 2: Maximum Hashrate ===
         max_hash_plan = []
+        tot_rev = tot_cost = 0
         for hour_info in rates_24h:
             hour = hour_info['hour']
             rate = hour_info['rate']
             hr_hs = fleet_hashrate_hs
-            revenue = (hr_hs * 3600 * block_subsidy) / (difficulty * (2**32)) * btc_price
-            cost = (fleet_power_watts / 1000) * rate
+            revenue = hr_hs * revenue_coef
+            cost = fleet_power_watts * 0.001 * rate
+            rounded_revenue = round(revenue, 6)
+            rounded_cost = round(cost, 6)
             max_hash_plan.append({
                 'hour': hour, 'frequency': max_frequency,
-                'profit': round(revenue - cost, 6), 'revenue': round(revenue, 6),
-                'cost': round(cost, 6), 'rate': rate
+                'profit': round(revenue - cost, 6), 'revenue': rounded_revenue,
+                'cost': rounded_cost, 'rate': rate
             })
+            tot_rev += rounded_revenue
+            tot_cost += rounded_cost
 
-        strategies.append(self._build_strategy('Maximum Hashrate', max_hash_plan, btc_price))
+        mining_hours = len(max_hash_plan) if max_frequency > 0 else 0
+        strategies.append(self._build_strategy('Maximum Hashrate', max_hash_plan, btc_price,
+                                               tot_rev, tot_cost, mining_hours))
 
         # === Strategy 3: Balanced ===
         avg_rate = sum(h['rate'] for h in rates_24h) / 24 if rates_24h else 0.12
         balanced_plan = []
         reduced_freq = min_frequency + int((max_frequency - min_frequency) * 0.6)
+        tot_rev = tot_cost = 0
+        mining_hours = 0
 
         for hour_info in rates_24h:
             hour = hour_info['hour']
@@ -1979,25 +2169,32 @@ class StrategyOptimizer:
             else:
                 freq = reduced_freq
 
-            hr_hs, hr_power = self._estimate_at_frequency(freq, max_frequency, fleet_hashrate_hs, fleet_power_watts)
-            revenue = (hr_hs * 3600 * block_subsidy) / (difficulty * (2**32)) * btc_price
-            cost = (hr_power / 1000) * rate
+            hr_hs, hr_power = _estimate_at_frequency(freq, max_frequency, fleet_hashrate_hs, fleet_power_watts)
+            revenue = hr_hs * revenue_coef
+            cost = hr_power * 0.001 * rate
+            rounded_revenue = round(revenue, 6)
+            rounded_cost = round(cost, 6)
             balanced_plan.append({
                 'hour': hour, 'frequency': freq,
-                'profit': round(revenue - cost, 6), 'revenue': round(revenue, 6),
-                'cost': round(cost, 6), 'rate': rate
+                'profit': round(revenue - cost, 6), 'revenue': rounded_revenue,
+                'cost': rounded_cost, 'rate': rate
             })
+            tot_rev += rounded_revenue
+            tot_cost += rounded_cost
+            mining_hours += freq > 0
 
-        strategies.append(self._build_strategy('Balanced', balanced_plan, btc_price))
+        strategies.append(self._build_strategy('Balanced', balanced_plan, btc_price,
+                                               tot_rev, tot_cost, mining_hours))
 
         return strategies
 
-    def _build_strategy(self, name: str, hourly_plan: List[Dict], btc_price: float) -> Dict:
-        """Build strategy summary with projections."""
-        daily_revenue = sum(h['revenue'] for h in hourly_plan)
-        daily_cost = sum(h['cost'] for h in hourly_plan)
+    def _build_strategy(self, name: str, hourly_plan: List[Dict], btc_price: float,
+                        daily_revenue: float, daily_cost: float, mining_hours: int) -> Dict:
+        """Build strategy summary with projections.
+
+        Totals are accumulated by the caller while building hourly_plan.
+        """
         daily_profit = daily_revenue - daily_cost
-        mining_hours = sum(1 for h in hourly_plan if h['frequency'] > 0)
         btc_per_day = daily_revenue / btc_price if btc_price > 0 else 0
 
         return {
@@ -2020,483 +2217,506 @@ class StrategyOptimizer:
     def apply_strategy(self, strategy_name: str, hourly_plan: List[Dict]):
         """Apply a strategy as a mining schedule by grouping consecutive hours with same frequency."""
         # Clear existing schedules
-        for schedule in self.db.get_mining_schedules():
-            self.db.delete_mining_schedule(schedule['id'])
+        self.db.delete_active_mining_schedules()
 
         if not hourly_plan:
             return
 
         # Group consecutive hours with same frequency into time blocks
         blocks = []
-        current_block = {'start_hour': hourly_plan[0]['hour'], 'frequency': hourly_plan[0]['frequency']}
-
-        for i in range(1, len(hourly_plan)):
-            if hourly_plan[i]['frequency'] == current_block['frequency']:
-                continue  # Same frequency, extend block
-            else:
-                current_block['end_hour'] = hourly_plan[i - 1]['hour']
-                blocks.append(current_block)
-                current_block = {'start_hour': hourly_plan[i]['hour'], 'frequency': hourly_plan[i]['frequency']}
-
-        # Close last block
-        current_block['end_hour'] = hourly_plan[-1]['hour']
-        blocks.append(current_block)
+        for freq, group in groupby(hourly_plan, key=itemgetter('frequency')):
+            group = list(group)
+            blocks.append({
+                'start_hour': group[0]['hour'],
+                'end_hour': group[-1]['hour'],
+                'frequency': freq
+            })
 
         # Create schedule entries
+        schedules = []
         for block in blocks:
             start_time = f"{block['start_hour']:02d}:00"
             end_hour = (block['end_hour'] + 1) % 24
             end_time = "23:59" if end_hour == 0 else f"{end_hour:02d}:00"
 
-            self.db.add_mining_schedule(
-                start_time=start_time,
-                end_time=end_time,
-                target_frequency=block['frequency'],
-                day_of_week=None,
-                enabled=1
-            )
+            schedules.append({
+                'start_time': start_time,
+                'end_time': end_time,
+                'target_frequency': block['frequency'],
+                'day_of_week': None,
+                'enabled': 1
+            })
+        self.db.add_mining_schedules(schedules)
 
         logger.info(f"Applied strategy '{strategy_name}' with {len(blocks)} schedule blocks")
 
 
-# Preset energy company rates
-ENERGY_COMPANY_PRESETS = {
-    # Major National/Regional Providers
-    "Xcel Energy (Colorado)": {
-        "location": "Colorado (Denver, Boulder, Fort Collins, Evergreen)",
-        # NOTE: These rates are ESTIMATES and may not match your actual bill.
-        # Xcel rates vary by plan, season, and tier. Verify at:
-        # https://co.my.xcelenergy.com/s/rates-and-regulations
-        # Check your bill for accurate rates and update these values accordingly.
-        "rates": [
-            {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.09, "rate_type": "off-peak"},
-            {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.17, "rate_type": "peak"},
-            {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "off-peak"},
-        ]
-    },
-    "Xcel Energy (Minnesota)": {
-        "location": "Minnesota (Minneapolis, St. Paul)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "09:00", "rate_per_kwh": 0.08, "rate_type": "off-peak"},
-            {"start_time": "09:00", "end_time": "21:00", "rate_per_kwh": 0.14, "rate_type": "peak"},
-            {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.08, "rate_type": "off-peak"},
-        ]
-    },
-    "Xcel Energy (Texas)": {
-        "location": "Texas (Lubbock, Amarillo)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-            {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.16, "rate_type": "peak"},
-            {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-        ]
-    },
-
-    # California
-    "PG&E (California)": {
-        "location": "California (San Francisco, Sacramento, North CA)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "15:00", "rate_per_kwh": 0.32, "rate_type": "off-peak"},
-            {"start_time": "15:00", "end_time": "21:00", "rate_per_kwh": 0.52, "rate_type": "peak"},
-            {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.32, "rate_type": "off-peak"},
-        ]
-    },
-    "SCE (Southern California Edison)": {
-        "location": "California (Los Angeles, Orange County)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "16:00", "rate_per_kwh": 0.30, "rate_type": "off-peak"},
-            {"start_time": "16:00", "end_time": "21:00", "rate_per_kwh": 0.48, "rate_type": "peak"},
-            {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.30, "rate_type": "off-peak"},
-        ]
-    },
-    "SDG&E (San Diego Gas & Electric)": {
-        "location": "California (San Diego)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "16:00", "rate_per_kwh": 0.35, "rate_type": "off-peak"},
-            {"start_time": "16:00", "end_time": "21:00", "rate_per_kwh": 0.58, "rate_type": "peak"},
-            {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.35, "rate_type": "off-peak"},
-        ]
-    },
-
-    # New York
-    "ConEd (Consolidated Edison)": {
-        "location": "New York (NYC, Westchester)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "08:00", "rate_per_kwh": 0.18, "rate_type": "off-peak"},
-            {"start_time": "08:00", "end_time": "20:00", "rate_per_kwh": 0.25, "rate_type": "peak"},
-            {"start_time": "20:00", "end_time": "23:59", "rate_per_kwh": 0.18, "rate_type": "off-peak"},
-        ]
-    },
-    "NYSEG (New York State Electric & Gas)": {
-        "location": "New York (Upstate, Rochester, Syracuse)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.16, "rate_type": "standard"},
-        ]
-    },
-
-    # Texas
-    "Oncor (Texas)": {
-        "location": "Texas (Dallas, Fort Worth)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.11, "rate_type": "off-peak"},
-            {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.18, "rate_type": "peak"},
-            {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "off-peak"},
-        ]
-    },
-    "CenterPoint Energy (Texas)": {
-        "location": "Texas (Houston)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-            {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.17, "rate_type": "peak"},
-            {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-        ]
-    },
-    "AEP Texas": {
-        "location": "Texas (Corpus Christi, South TX)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "standard"},
-        ]
-    },
-
-    # Florida
-    "FPL (Florida Power & Light)": {
-        "location": "Florida (Miami, Fort Lauderdale, West Palm Beach)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "12:00", "rate_per_kwh": 0.11, "rate_type": "off-peak"},
-            {"start_time": "12:00", "end_time": "21:00", "rate_per_kwh": 0.15, "rate_type": "peak"},
-            {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "off-peak"},
-        ]
-    },
-    "Duke Energy Florida": {
-        "location": "Florida (Tampa, St. Petersburg, Orlando)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "standard"},
-        ]
-    },
-
-    # Georgia
-    "Georgia Power": {
-        "location": "Georgia (Atlanta, Savannah)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-            {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.16, "rate_type": "peak"},
-            {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-        ]
-    },
-
-    # North/South Carolina
-    "Duke Energy Carolinas": {
-        "location": "North Carolina, South Carolina (Charlotte, Raleigh)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
-        ]
-    },
-
-    # Illinois
-    "ComEd (Commonwealth Edison)": {
-        "location": "Illinois (Chicago)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "13:00", "rate_per_kwh": 0.09, "rate_type": "off-peak"},
-            {"start_time": "13:00", "end_time": "19:00", "rate_per_kwh": 0.15, "rate_type": "peak"},
-            {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "off-peak"},
-        ]
-    },
-
-    # Ohio
-    "AEP Ohio": {
-        "location": "Ohio (Columbus)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
-        ]
-    },
-    "Duke Energy Ohio": {
-        "location": "Ohio (Cincinnati)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
-        ]
-    },
-
-    # Michigan
-    "DTE Energy": {
-        "location": "Michigan (Detroit)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "11:00", "rate_per_kwh": 0.12, "rate_type": "off-peak"},
-            {"start_time": "11:00", "end_time": "19:00", "rate_per_kwh": 0.18, "rate_type": "peak"},
-            {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "off-peak"},
-        ]
-    },
-
-    # Pennsylvania
-    "PECO Energy": {
-        "location": "Pennsylvania (Philadelphia)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.13, "rate_type": "standard"},
-        ]
-    },
-
-    # Washington
-    "Seattle City Light": {
-        "location": "Washington (Seattle)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
-        ]
-    },
-    "Puget Sound Energy": {
-        "location": "Washington (Bellevue, Tacoma)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
-        ]
-    },
-
-    # Oregon
-    "Portland General Electric": {
-        "location": "Oregon (Portland)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
-        ]
-    },
-
-    # Nevada
-    "NV Energy": {
-        "location": "Nevada (Las Vegas, Reno)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "13:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-            {"start_time": "13:00", "end_time": "19:00", "rate_per_kwh": 0.16, "rate_type": "peak"},
-            {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-        ]
-    },
-
-    # Arizona
-    "APS (Arizona Public Service)": {
-        "location": "Arizona (Phoenix)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "15:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-            {"start_time": "15:00", "end_time": "20:00", "rate_per_kwh": 0.18, "rate_type": "peak"},
-            {"start_time": "20:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
-        ]
-    },
-
-    # Utah
-    "Rocky Mountain Power (Utah)": {
-        "location": "Utah (Salt Lake City)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
-        ]
-    },
-
-    # Idaho
-    "Idaho Power": {
-        "location": "Idaho (Boise)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "standard"},
-        ]
-    },
-
-    # Montana
-    "NorthWestern Energy (Montana)": {
-        "location": "Montana (Billings, Missoula)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
-        ]
-    },
+def _freeze_presets(presets: Dict) -> MappingProxyType:
+    """Make presets read-only, sharing identical rate entries and rate tuples between presets"""
+    rate_pool = {}
+    rate_blocks = {}
+    frozen = {}
+    for name, preset in presets.items():
+        key = tuple(tuple(sorted(rate.items())) for rate in preset['rates'])
+        if key not in rate_blocks:
+            rate_blocks[key] = tuple(
+                rate_pool.setdefault(rate_key, MappingProxyType(dict(rate_key)))
+                for rate_key in key
+            )
+        frozen[name] = MappingProxyType({**preset, 'rates': rate_blocks[key]})
+    return MappingProxyType(frozen)
 
-    # Wyoming
-    "Rocky Mountain Power (Wyoming)": {
-        "location": "Wyoming (Cheyenne)",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "standard"},
-        ]
-    },
 
-    # ========== CANADA ==========
-    "Hydro-Québec (Canada)": {
-        "location": "Quebec, Canada",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.07, "rate_type": "standard"},
-        ]
-    },
-    "BC Hydro (Canada)": {
-        "location": "British Columbia, Canada",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "standard"},
-        ]
-    },
-    "Ontario Hydro (Canada)": {
-        "location": "Ontario, Canada",
-        "rates": [
-            {"start_time": "00:00", "end_time": "07:00", "rate_per_kwh": 0.08, "rate_type": "off-peak"},
-            {"start_time": "07:00", "end_time": "19:00", "rate_per_kwh": 0.13, "rate_type": "peak"},
-            {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.08, "rate_type": "off-peak"},
-        ]
-    },
-    "Alberta Electric (Canada)": {
-        "location": "Alberta, Canada",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
-        ]
-    },
-
-    # ========== EUROPE ==========
-    "EDF (France)": {
-        "location": "France",
-        "rates": [
-            {"start_time": "00:00", "end_time": "06:00", "rate_per_kwh": 0.15, "rate_type": "off-peak"},
-            {"start_time": "06:00", "end_time": "22:00", "rate_per_kwh": 0.20, "rate_type": "peak"},
-            {"start_time": "22:00", "end_time": "23:59", "rate_per_kwh": 0.15, "rate_type": "off-peak"},
-        ]
-    },
-    "E.ON (Germany)": {
-        "location": "Germany",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.32, "rate_type": "standard"},
-        ]
-    },
-    "Enel (Italy)": {
-        "location": "Italy",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.28, "rate_type": "standard"},
-        ]
-    },
-    "Iberdrola (Spain)": {
-        "location": "Spain",
-        "rates": [
-            {"start_time": "00:00", "end_time": "08:00", "rate_per_kwh": 0.12, "rate_type": "off-peak"},
-            {"start_time": "08:00", "end_time": "22:00", "rate_per_kwh": 0.18, "rate_type": "peak"},
-            {"start_time": "22:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "off-peak"},
-        ]
-    },
-    "British Gas (UK)": {
-        "location": "United Kingdom",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.24, "rate_type": "standard"},
-        ]
-    },
-    "EDF Energy (UK)": {
-        "location": "United Kingdom",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.25, "rate_type": "standard"},
-        ]
-    },
-    "Vattenfall (Sweden)": {
-        "location": "Sweden",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.14, "rate_type": "standard"},
-        ]
-    },
-    "Fortum (Norway/Finland)": {
-        "location": "Norway, Finland",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
-        ]
-    },
-
-    # ========== ASIA-PACIFIC ==========
-    "China State Grid": {
-        "location": "China",
-        "rates": [
-            {"start_time": "00:00", "end_time": "08:00", "rate_per_kwh": 0.06, "rate_type": "off-peak"},
-            {"start_time": "08:00", "end_time": "22:00", "rate_per_kwh": 0.09, "rate_type": "peak"},
-            {"start_time": "22:00", "end_time": "23:59", "rate_per_kwh": 0.06, "rate_type": "off-peak"},
-        ]
-    },
-    "TEPCO (Japan)": {
-        "location": "Tokyo, Japan",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.21, "rate_type": "standard"},
-        ]
-    },
-    "KEPCO (South Korea)": {
-        "location": "South Korea",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
-        ]
-    },
-    "AGL Energy (Australia)": {
-        "location": "Australia",
-        "rates": [
-            {"start_time": "00:00", "end_time": "07:00", "rate_per_kwh": 0.18, "rate_type": "off-peak"},
-            {"start_time": "07:00", "end_time": "21:00", "rate_per_kwh": 0.28, "rate_type": "peak"},
-            {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.18, "rate_type": "off-peak"},
-        ]
-    },
-    "Origin Energy (Australia)": {
-        "location": "Australia",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.25, "rate_type": "standard"},
-        ]
-    },
-    "Contact Energy (New Zealand)": {
-        "location": "New Zealand",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.17, "rate_type": "standard"},
-        ]
-    },
-    "Singapore Power": {
-        "location": "Singapore",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.18, "rate_type": "standard"},
-        ]
-    },
-
-    # ========== MIDDLE EAST ==========
-    "DEWA (Dubai)": {
-        "location": "Dubai, UAE",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
-        ]
-    },
-    "Saudi Electricity Company": {
-        "location": "Saudi Arabia",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.05, "rate_type": "standard"},
-        ]
-    },
+# Preset energy company rates
+@lru_cache(maxsize=None)
+def get_energy_company_presets() -> MappingProxyType:
+    """Build the read-only preset table on first use rather than at import"""
+    presets = {
+        # Major National/Regional Providers
+        "Xcel Energy (Colorado)": {
+            "location": "Colorado (Denver, Boulder, Fort Collins, Evergreen)",
+            # NOTE: These rates are ESTIMATES and may not match your actual bill.
+            # Xcel rates vary by plan, season, and tier. Verify at:
+            # https://co.my.xcelenergy.com/s/rates-and-regulations
+            # Check your bill for accurate rates and update these values accordingly.
+            "rates": [
+                {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.09, "rate_type": "off-peak"},
+                {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.17, "rate_type": "peak"},
+                {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "off-peak"},
+            ]
+        },
+        "Xcel Energy (Minnesota)": {
+            "location": "Minnesota (Minneapolis, St. Paul)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "09:00", "rate_per_kwh": 0.08, "rate_type": "off-peak"},
+                {"start_time": "09:00", "end_time": "21:00", "rate_per_kwh": 0.14, "rate_type": "peak"},
+                {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.08, "rate_type": "off-peak"},
+            ]
+        },
+        "Xcel Energy (Texas)": {
+            "location": "Texas (Lubbock, Amarillo)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+                {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.16, "rate_type": "peak"},
+                {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+            ]
+        },
+
+        # California
+        "PG&E (California)": {
+            "location": "California (San Francisco, Sacramento, North CA)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "15:00", "rate_per_kwh": 0.32, "rate_type": "off-peak"},
+                {"start_time": "15:00", "end_time": "21:00", "rate_per_kwh": 0.52, "rate_type": "peak"},
+                {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.32, "rate_type": "off-peak"},
+            ]
+        },
+        "SCE (Southern California Edison)": {
+            "location": "California (Los Angeles, Orange County)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "16:00", "rate_per_kwh": 0.30, "rate_type": "off-peak"},
+                {"start_time": "16:00", "end_time": "21:00", "rate_per_kwh": 0.48, "rate_type": "peak"},
+                {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.30, "rate_type": "off-peak"},
+            ]
+        },
+        "SDG&E (San Diego Gas & Electric)": {
+            "location": "California (San Diego)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "16:00", "rate_per_kwh": 0.35, "rate_type": "off-peak"},
+                {"start_time": "16:00", "end_time": "21:00", "rate_per_kwh": 0.58, "rate_type": "peak"},
+                {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.35, "rate_type": "off-peak"},
+            ]
+        },
+
+        # New York
+        "ConEd (Consolidated Edison)": {
+            "location": "New York (NYC, Westchester)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "08:00", "rate_per_kwh": 0.18, "rate_type": "off-peak"},
+                {"start_time": "08:00", "end_time": "20:00", "rate_per_kwh": 0.25, "rate_type": "peak"},
+                {"start_time": "20:00", "end_time": "23:59", "rate_per_kwh": 0.18, "rate_type": "off-peak"},
+            ]
+        },
+        "NYSEG (New York State Electric & Gas)": {
+            "location": "New York (Upstate, Rochester, Syracuse)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.16, "rate_type": "standard"},
+            ]
+        },
+
+        # Texas
+        "Oncor (Texas)": {
+            "location": "Texas (Dallas, Fort Worth)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.11, "rate_type": "off-peak"},
+                {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.18, "rate_type": "peak"},
+                {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "off-peak"},
+            ]
+        },
+        "CenterPoint Energy (Texas)": {
+            "location": "Texas (Houston)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+                {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.17, "rate_type": "peak"},
+                {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+            ]
+        },
+        "AEP Texas": {
+            "location": "Texas (Corpus Christi, South TX)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "standard"},
+            ]
+        },
+
+        # Florida
+        "FPL (Florida Power & Light)": {
+            "location": "Florida (Miami, Fort Lauderdale, West Palm Beach)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "12:00", "rate_per_kwh": 0.11, "rate_type": "off-peak"},
+                {"start_time": "12:00", "end_time": "21:00", "rate_per_kwh": 0.15, "rate_type": "peak"},
+                {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "off-peak"},
+            ]
+        },
+        "Duke Energy Florida": {
+            "location": "Florida (Tampa, St. Petersburg, Orlando)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "standard"},
+            ]
+        },
+
+        # Georgia
+        "Georgia Power": {
+            "location": "Georgia (Atlanta, Savannah)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "14:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+                {"start_time": "14:00", "end_time": "19:00", "rate_per_kwh": 0.16, "rate_type": "peak"},
+                {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+            ]
+        },
+
+        # North/South Carolina
+        "Duke Energy Carolinas": {
+            "location": "North Carolina, South Carolina (Charlotte, Raleigh)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
+            ]
+        },
+
+        # Illinois
+        "ComEd (Commonwealth Edison)": {
+            "location": "Illinois (Chicago)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "13:00", "rate_per_kwh": 0.09, "rate_type": "off-peak"},
+                {"start_time": "13:00", "end_time": "19:00", "rate_per_kwh": 0.15, "rate_type": "peak"},
+                {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "off-peak"},
+            ]
+        },
+
+        # Ohio
+        "AEP Ohio": {
+            "location": "Ohio (Columbus)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
+            ]
+        },
+        "Duke Energy Ohio": {
+            "location": "Ohio (Cincinnati)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
+            ]
+        },
+
+        # Michigan
+        "DTE Energy": {
+            "location": "Michigan (Detroit)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "11:00", "rate_per_kwh": 0.12, "rate_type": "off-peak"},
+                {"start_time": "11:00", "end_time": "19:00", "rate_per_kwh": 0.18, "rate_type": "peak"},
+                {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "off-peak"},
+            ]
+        },
+
+        # Pennsylvania
+        "PECO Energy": {
+            "location": "Pennsylvania (Philadelphia)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.13, "rate_type": "standard"},
+            ]
+        },
+
+        # Washington
+        "Seattle City Light": {
+            "location": "Washington (Seattle)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
+            ]
+        },
+        "Puget Sound Energy": {
+            "location": "Washington (Bellevue, Tacoma)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
+            ]
+        },
+
+        # Oregon
+        "Portland General Electric": {
+            "location": "Oregon (Portland)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
+            ]
+        },
+
+        # Nevada
+        "NV Energy": {
+            "location": "Nevada (Las Vegas, Reno)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "13:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+                {"start_time": "13:00", "end_time": "19:00", "rate_per_kwh": 0.16, "rate_type": "peak"},
+                {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+            ]
+        },
+
+        # Arizona
+        "APS (Arizona Public Service)": {
+            "location": "Arizona (Phoenix)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "15:00", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+                {"start_time": "15:00", "end_time": "20:00", "rate_per_kwh": 0.18, "rate_type": "peak"},
+                {"start_time": "20:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "off-peak"},
+            ]
+        },
+
+        # Utah
+        "Rocky Mountain Power (Utah)": {
+            "location": "Utah (Salt Lake City)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
+            ]
+        },
+
+        # Idaho
+        "Idaho Power": {
+            "location": "Idaho (Boise)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "standard"},
+            ]
+        },
+
+        # Montana
+        "NorthWestern Energy (Montana)": {
+            "location": "Montana (Billings, Missoula)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
+            ]
+        },
+
+        # Wyoming
+        "Rocky Mountain Power (Wyoming)": {
+            "location": "Wyoming (Cheyenne)",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "standard"},
+            ]
+        },
+
+        # ========== CANADA ==========
+        "Hydro-Québec (Canada)": {
+            "location": "Quebec, Canada",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.07, "rate_type": "standard"},
+            ]
+        },
+        "BC Hydro (Canada)": {
+            "location": "British Columbia, Canada",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.09, "rate_type": "standard"},
+            ]
+        },
+        "Ontario Hydro (Canada)": {
+            "location": "Ontario, Canada",
+            "rates": [
+                {"start_time": "00:00", "end_time": "07:00", "rate_per_kwh": 0.08, "rate_type": "off-peak"},
+                {"start_time": "07:00", "end_time": "19:00", "rate_per_kwh": 0.13, "rate_type": "peak"},
+                {"start_time": "19:00", "end_time": "23:59", "rate_per_kwh": 0.08, "rate_type": "off-peak"},
+            ]
+        },
+        "Alberta Electric (Canada)": {
+            "location": "Alberta, Canada",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
+            ]
+        },
+
+        # ========== EUROPE ==========
+        "EDF (France)": {
+            "location": "France",
+            "rates": [
+                {"start_time": "00:00", "end_time": "06:00", "rate_per_kwh": 0.15, "rate_type": "off-peak"},
+                {"start_time": "06:00", "end_time": "22:00", "rate_per_kwh": 0.20, "rate_type": "peak"},
+                {"start_time": "22:00", "end_time": "23:59", "rate_per_kwh": 0.15, "rate_type": "off-peak"},
+            ]
+        },
+        "E.ON (Germany)": {
+            "location": "Germany",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.32, "rate_type": "standard"},
+            ]
+        },
+        "Enel (Italy)": {
+            "location": "Italy",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.28, "rate_type": "standard"},
+            ]
+        },
+        "Iberdrola (Spain)": {
+            "location": "Spain",
+            "rates": [
+                {"start_time": "00:00", "end_time": "08:00", "rate_per_kwh": 0.12, "rate_type": "off-peak"},
+                {"start_time": "08:00", "end_time": "22:00", "rate_per_kwh": 0.18, "rate_type": "peak"},
+                {"start_time": "22:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "off-peak"},
+            ]
+        },
+        "British Gas (UK)": {
+            "location": "United Kingdom",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.24, "rate_type": "standard"},
+            ]
+        },
+        "EDF Energy (UK)": {
+            "location": "United Kingdom",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.25, "rate_type": "standard"},
+            ]
+        },
+        "Vattenfall (Sweden)": {
+            "location": "Sweden",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.14, "rate_type": "standard"},
+            ]
+        },
+        "Fortum (Norway/Finland)": {
+            "location": "Norway, Finland",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
+            ]
+        },
+
+        # ========== ASIA-PACIFIC ==========
+        "China State Grid": {
+            "location": "China",
+            "rates": [
+                {"start_time": "00:00", "end_time": "08:00", "rate_per_kwh": 0.06, "rate_type": "off-peak"},
+                {"start_time": "08:00", "end_time": "22:00", "rate_per_kwh": 0.09, "rate_type": "peak"},
+                {"start_time": "22:00", "end_time": "23:59", "rate_per_kwh": 0.06, "rate_type": "off-peak"},
+            ]
+        },
+        "TEPCO (Japan)": {
+            "location": "Tokyo, Japan",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.21, "rate_type": "standard"},
+            ]
+        },
+        "KEPCO (South Korea)": {
+            "location": "South Korea",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
+            ]
+        },
+        "AGL Energy (Australia)": {
+            "location": "Australia",
+            "rates": [
+                {"start_time": "00:00", "end_time": "07:00", "rate_per_kwh": 0.18, "rate_type": "off-peak"},
+                {"start_time": "07:00", "end_time": "21:00", "rate_per_kwh": 0.28, "rate_type": "peak"},
+                {"start_time": "21:00", "end_time": "23:59", "rate_per_kwh": 0.18, "rate_type": "off-peak"},
+            ]
+        },
+        "Origin Energy (Australia)": {
+            "location": "Australia",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.25, "rate_type": "standard"},
+            ]
+        },
+        "Contact Energy (New Zealand)": {
+            "location": "New Zealand",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.17, "rate_type": "standard"},
+            ]
+        },
+        "Singapore Power": {
+            "location": "Singapore",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.18, "rate_type": "standard"},
+            ]
+        },
+
+        # ========== MIDDLE EAST ==========
+        "DEWA (Dubai)": {
+            "location": "Dubai, UAE",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.10, "rate_type": "standard"},
+            ]
+        },
+        "Saudi Electricity Company": {
+            "location": "Saudi Arabia",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.05, "rate_type": "standard"},
+            ]
+        },
+
+        # ========== LATIN AMERICA ==========
+        "CFE (Mexico)": {
+            "location": "Mexico",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.08, "rate_type": "standard"},
+            ]
+        },
+        "Enel Chile": {
+            "location": "Chile",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.14, "rate_type": "standard"},
+            ]
+        },
+        "Eletrobras (Brazil)": {
+            "location": "Brazil",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
+            ]
+        },
+
+        # ========== AFRICA ==========
+        "Eskom (South Africa)": {
+            "location": "South Africa",
+            "rates": [
+                {"start_time": "00:00", "end_time": "06:00", "rate_per_kwh": 0.06, "rate_type": "off-peak"},
+                {"start_time": "06:00", "end_time": "22:00", "rate_per_kwh": 0.11, "rate_type": "peak"},
+                {"start_time": "22:00", "end_time": "23:59", "rate_per_kwh": 0.06, "rate_type": "off-peak"},
+            ]
+        },
+
+        # ========== ICELAND (Popular for Mining) ==========
+        "Landsvirkjun (Iceland)": {
+            "location": "Iceland",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.04, "rate_type": "standard"},
+            ]
+        },
+
+        # Custom Entry
+        "Custom (Manual Entry)": {
+            "location": "Custom Location",
+            "rates": [
+                {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "standard"},
+            ]
+        }
+    }
+    return _freeze_presets(presets)
 
-    # ========== LATIN AMERICA ==========
-    "CFE (Mexico)": {
-        "location": "Mexico",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.08, "rate_type": "standard"},
-        ]
-    },
-    "Enel Chile": {
-        "location": "Chile",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.14, "rate_type": "standard"},
-        ]
-    },
-    "Eletrobras (Brazil)": {
-        "location": "Brazil",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.11, "rate_type": "standard"},
-        ]
-    },
-
-    # ========== AFRICA ==========
-    "Eskom (South Africa)": {
-        "location": "South Africa",
-        "rates": [
-            {"start_time": "00:00", "end_time": "06:00", "rate_per_kwh": 0.06, "rate_type": "off-peak"},
-            {"start_time": "06:00", "end_time": "22:00", "rate_per_kwh": 0.11, "rate_type": "peak"},
-            {"start_time": "22:00", "end_time": "23:59", "rate_per_kwh": 0.06, "rate_type": "off-peak"},
-        ]
-    },
 
-    # ========== ICELAND (Popular for Mining) ==========
-    "Landsvirkjun (Iceland)": {
-        "location": "Iceland",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.04, "rate_type": "standard"},
-        ]
-    },
+def __getattr__(name):
+    # Keep `from energy import ENERGY_COMPANY_PRESETS` working without building it at import
+    if name == 'ENERGY_COMPANY_PRESETS':
+        return get_energy_company_presets()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    # Custom Entry
-    "Custom (Manual Entry)": {
-        "location": "Custom Location",
-        "rates": [
-            {"start_time": "00:00", "end_time": "23:59", "rate_per_kwh": 0.12, "rate_type": "standard"},
-        ]
-    }
-}
 
 # Brand name to subsidiary mapping for OpenEI API searches.
 # OpenEI uses legal subsidiary names, not brand names. This mapping allows
@@ -2673,3 +2893,12 @@ BRAND_TO_SUBSIDIARIES = {
         "MidAmerican Energy Company"
     ],
 }
+
+# Read-only views: subsidiary tuples, and the same pre-lowered for matching
+BRAND_TO_SUBSIDIARIES = MappingProxyType({
+    brand: tuple(subsidiaries) for brand, subsidiaries in BRAND_TO_SUBSIDIARIES.items()
+})
+_BRAND_TO_SUBSIDIARIES_LOWER = {
+    brand: tuple(sub.lower() for sub in subsidiaries)
+    for brand, subsidiaries in BRAND_TO_SUBSIDIARIES.items()
+}
@@ -6,13 +6,28 @@ Uses LNBits API for receiving payments.
 """
 import logging
 import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+
+try:
+    import orjson  # Optional: faster JSON encode/decode for LNBits calls
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4)
+def _iso_now(epoch_second: int) -> str:
+    """UTC ISO timestamp for a whole second; calls within the same second share one string"""
+    return datetime.fromtimestamp(epoch_second, tz=timezone.utc).isoformat()
+
+
 class LightningDonationManager:
     """
     Manages Lightning donations for DirtySats development.
@@ -30,6 +45,14 @@ class LightningDonationManager:
         # LNBits configuration
         self.lnbits_url = lnbits_url or os.environ.get("LNBITS_URL") or "https://legend.lnbits.com"
         self.lnbits_key = lnbits_key or os.environ.get("LNBITS_KEY")
+
+        # Reuse one keep-alive connection to LNBits instead of a new TLS handshake per call
+        self._session = requests.Session()
+        adapter = HTTPAdapter(max_retries=Retry(total=2, backoff_factor=0.2))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if self.lnbits_key:
+            self._session.headers.update({"X-Api-Key": self.lnbits_key})
         
         # Donation settings
         self.donation_amounts = [500, 1000, 5000, 21000]  # sats
@@ -57,23 +80,34 @@ class LightningDonationManager:
 
         try:
             url = f"{self.lnbits_url}/api/v1/payments"
-            headers = {"X-Api-Key": self.lnbits_key}
             payload = {
                 "out": False,  # Receiving payment
                 "amount": amount_sats,
                 "memo": description or self.donation_description,
             }
 
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            if orjson:
+                response = self._session.post(
+                    url, data=orjson.dumps(payload),
+                    headers={"Content-Type": "application/json"}, timeout=10
+                )
+            else:
+                response = self._session.post(url, json=payload, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
+            payment_request = data.get("payment_request")
+            checking_id = data.get("checking_id")
+            if not payment_request or not checking_id:
+                logger.error("LNBits invoice response missing payment_request or checking_id")
+                return None
+
             return {
-                "payment_request": data.get("payment_request"),
-                "checking_id": data.get("checking_id"),
+                "payment_request": payment_request,
+                "checking_id": checking_id,
                 "amount": amount_sats,
                 "description": description or self.donation_description,
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": _iso_now(int(time.time())),
             }
 
         except Exception as e:
@@ -100,16 +134,15 @@ class LightningDonationManager:
 
         try:
             url = f"{self.lnbits_url}/api/v1/payments/{checking_id}"
-            headers = {"X-Api-Key": self.lnbits_key}
 
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._session.get(url, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
             return {
                 "paid": data.get("paid", False),
                 "amount": data.get("amount"),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _iso_now(int(time.time())),
             }
 
         except Exception as e:
@@ -2,25 +2,93 @@
 DirtySats Metrics - Real-time tracking and analytics for mining profitability
 """
 import logging
+import sqlite3
+import time
+import weakref
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from database import Database
 
 logger = logging.getLogger(__name__)
 
+# Pool difficulty average = 1 share per ~992 sats at current difficulty.
+# Each accepted share on mainnet = ~6.25 BTC / 630000 shares per block
+# = ~0.00000992 BTC = ~992 sats (varies with difficulty); adjust for pool/solo.
+SATS_PER_SHARE = 992
+
 # Temporary database adapter until full migration
 def execute_db_query(db, query, params=()):
-    """Adapter function for database queries"""
+    """Adapter function for read-only (SELECT) database queries"""
     try:
-        with db._get_connection() as conn:
+        # Readonly skips the write lock, so metrics reads neither queue behind
+        # each other nor block the stats writer
+        with db._get_connection(readonly=True) as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             return cursor.fetchall()
-    except Exception as e:
+    except sqlite3.Error as e:
         logger.error(f"Database query failed: {e}")
         return []
 
 
+class _StatsResultCache:
+    """
+    Short-lived cache for dashboard metrics computed from the stats table.
+
+    Entries expire after ttl seconds, or as soon as a new stats row is
+    written (checked with a cheap MAX(id) probe), so dashboards polling
+    every few seconds reuse one computation between monitor samples.
+    Some keys carry client query parameters, so outdated entries are dropped
+    on every write and at most max_entries are kept, oldest written first out.
+    """
+
+    def __init__(self, db: Database, ttl: float = 30, max_entries: int = 16):
+        self.db = db
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, or call compute() and cache its result"""
+        result = execute_db_query(self.db, "SELECT MAX(id) FROM stats")
+        marker = result[0][0] if result else None
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry and entry[0] == marker and now - entry[1] < self.ttl:
+            return entry[2]
+
+        value = compute()
+        entries = {
+            k: e for k, e in self._entries.items()
+            if k != key and e[0] == marker and now - e[1] < self.ttl
+        }
+        entries[key] = (marker, now, value)
+        while len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+        self._entries = entries
+        return value
+
+
+# One result cache per Database shared by all metrics classes, for data more
+# than one of them reads
+_shared_results = weakref.WeakKeyDictionary()
+
+
+def _latest_stats_snapshot(db: Database) -> Dict[str, Dict]:
+    """
+    Latest stats row per miner IP, shared between metrics classes.
+
+    Fleet health and the efficiency matrix both start from this snapshot, so a
+    dashboard rendering both runs the per-miner query once per stats sample.
+    Callers must treat the result as read-only.
+    """
+    cache = _shared_results.get(db)
+    if cache is None:
+        cache = _shared_results.setdefault(db, _StatsResultCache(db))
+    return cache.get_or_compute("latest_stats_by_ip", db.get_latest_stats_by_ip)
+
+
 class SatsEarnedTracker:
     """
     Tracks satoshi earnings with real-time, daily, weekly, and all-time metrics.
@@ -30,6 +98,7 @@ class SatsEarnedTracker:
     def __init__(self, db: Database, pool_manager=None):
         self.db = db
         self.pool_manager = pool_manager
+        self._results = _StatsResultCache(db)
 
     def get_sats_earned(self, hours: int = None) -> Dict:
         """
@@ -48,6 +117,12 @@ class SatsEarnedTracker:
                 'chart_data': [(timestamp, sats_earned), ...]
             }
         """
+        # The payload (chart included) doesn't depend on hours, so every caller
+        # shares one cached build instead of rebuilding it per hours value
+        return self._results.get_or_compute('sats_earned', self._compute_sats_earned)
+
+    def _compute_sats_earned(self) -> Dict:
+        """Run the sats-earned queries behind get_sats_earned"""
         now = datetime.utcnow()
 
         sats_today = self._calculate_sats_for_period(
@@ -81,9 +156,6 @@ class SatsEarnedTracker:
 
     def _calculate_sats_for_period(self, start: Optional[datetime], end: datetime) -> float:
         """Calculate total sats earned in a period based on shares accepted"""
-        # Each accepted share on mainnet = ~6.25 BTC / 630000 shares per block
-        # = ~0.00000992 BTC = ~992 sats (varies with difficulty)
-
         # stats.shares_accepted is typically cumulative, so use per-miner deltas.
         if start:
             result = execute_db_query(
@@ -102,41 +174,47 @@ class SatsEarnedTracker:
                 (start, end),
             )
         else:
+            # All-time spread per miner is maintained by a trigger on stats inserts
             result = execute_db_query(
                 self.db,
-                """
-                SELECT COALESCE(SUM(shares_delta), 0) AS total_shares
-                FROM (
-                    SELECT
-                        miner_id,
-                        MAX(COALESCE(shares_accepted, 0)) - MIN(COALESCE(shares_accepted, 0)) AS shares_delta
-                    FROM stats
-                    WHERE timestamp <= ?
-                    GROUP BY miner_id
-                )
-                """,
-                (end,),
+                "SELECT COALESCE(SUM(max_shares - min_shares), 0) AS total_shares FROM miner_share_totals",
             )
 
         total_shares = result[0][0] if result and result[0][0] else 0
-
-        # Pool difficulty average = 1 share per ~992 sats at current difficulty
-        # Adjust multiplier as needed based on pool/solo
-        sats_per_share = 992
-        return total_shares * sats_per_share
+        return total_shares * SATS_PER_SHARE
 
     def _get_hourly_sats_chart(self, end_time: datetime, hours: int = 24) -> List:
-        """Get hourly sats earned for chart"""
-        chart = []
-        for i in range(hours, 0, -1):
-            hour_start = end_time - timedelta(hours=i)
-            hour_end = hour_start + timedelta(hours=1)
-            sats = self._calculate_sats_for_period(hour_start, hour_end)
-            chart.append({
+        """Get hourly sats earned for chart in a single statement"""
+        hour_starts = [end_time - timedelta(hours=i) for i in range(hours, 0, -1)]
+
+        # One indexed range aggregate per hour, the same per-miner delta as
+        # _calculate_sats_for_period, combined with UNION ALL so SQLite does all
+        # the per-row work and returns just one total per hour
+        hour_query = """
+            SELECT ?, COALESCE(SUM(shares_delta), 0)
+            FROM (
+                SELECT MAX(COALESCE(shares_accepted, 0)) - MIN(COALESCE(shares_accepted, 0)) AS shares_delta
+                FROM stats
+                WHERE timestamp BETWEEN ? AND ?
+                GROUP BY miner_id
+            )
+        """
+        params = []
+        for index, hour_start in enumerate(hour_starts):
+            params += [index, hour_start, hour_start + timedelta(hours=1)]
+        rows = execute_db_query(self.db, " UNION ALL ".join([hour_query] * hours), params)
+
+        hourly_shares = [0] * hours
+        for index, total_shares in rows:
+            hourly_shares[index] = total_shares
+
+        return [
+            {
                 "timestamp": hour_start.isoformat(),
-                "sats": round(sats, 0),
-            })
-        return chart
+                "sats": round(total_shares * SATS_PER_SHARE, 0),
+            }
+            for hour_start, total_shares in zip(hour_starts, hourly_shares)
+        ]
 
 
 class MinerHealthMonitor:
@@ -151,6 +229,7 @@ class MinerHealthMonitor:
         self.TEMP_CRITICAL = 85
         self.HASHRATE_DROP_THRESHOLD = 0.2  # 20% drop
         self.OFFLINE_THRESHOLD_SECONDS = 120
+        self._results = _StatsResultCache(db)
 
     def get_fleet_health(self) -> Dict:
         """
@@ -177,7 +256,12 @@ class MinerHealthMonitor:
                 'recovery_opportunities': [...]
             }
         """
+        return self._results.get_or_compute('fleet_health', self._compute_fleet_health)
+
+    def _compute_fleet_health(self) -> Dict:
+        """Check every miner's latest stats behind get_fleet_health"""
         miners = self.db.get_all_miners()
+        latest_by_ip = _latest_stats_snapshot(self.db)
         health_status = {
             "status": "healthy",
             "total_miners": len(miners),
@@ -190,12 +274,9 @@ class MinerHealthMonitor:
         }
 
         for miner in miners:
-            miner_health = self._check_miner_health(miner["ip"])
+            miner_health = self._check_miner_health(miner["ip"], latest_by_ip.get(miner["ip"]))
             health_status[miner_health["status"]] += 1
-
-            if miner_health["issues"]:
-                for issue in miner_health["issues"]:
-                    health_status["issues"].append(issue)
+            health_status["issues"].extend(miner_health["issues"])
 
         # Determine overall status
         if health_status["critical"] > 0:
@@ -205,28 +286,16 @@ class MinerHealthMonitor:
 
         return health_status
 
-    def _check_miner_health(self, miner_ip: str) -> Dict:
-        """Check individual miner health"""
-        latest = execute_db_query(
-            self.db,
-            """
-            SELECT s.temperature, s.hashrate, s.shares_rejected
-            FROM stats s
-            JOIN miners m ON s.miner_id = m.id
-            WHERE m.ip = ?
-            ORDER BY s.timestamp DESC
-            LIMIT 1
-            """,
-            (miner_ip,),
-        )
-
+    def _check_miner_health(self, miner_ip: str, latest: Optional[Dict]) -> Dict:
+        """Check individual miner health from its latest stats row"""
         issues = []
         status = "healthy"
 
         if not latest:
             return {"status": "offline", "issues": [{"issue": "no_data", "severity": "critical"}]}
 
-        temp, hashrate, shares_rejected = latest[0]
+        temp = latest["temperature"]
+        hashrate = latest["hashrate"]
 
         # Check temperature
         if temp and temp > self.TEMP_CRITICAL:
@@ -270,6 +339,7 @@ class PowerEfficiencyMatrix:
 
     def __init__(self, db: Database):
         self.db = db
+        self._results = _StatsResultCache(db)
 
     def get_efficiency_matrix(self, electricity_rate_per_kwh: float = 0.12) -> Dict:
         """
@@ -299,29 +369,25 @@ class PowerEfficiencyMatrix:
                 'cost_optimization_potential': 'Reduce frequency on miner 10.0.0.101 by 10% to save $8.50/month'
             }
         """
-        miners = self.db.get_all_miners()
+        return self._results.get_or_compute(
+            ('efficiency_matrix', electricity_rate_per_kwh),
+            lambda: self._compute_efficiency_matrix(electricity_rate_per_kwh),
+        )
+
+    def _compute_efficiency_matrix(self, electricity_rate_per_kwh: float) -> Dict:
+        """Build per-miner efficiency rows behind get_efficiency_matrix"""
+        # Miners without stats are skipped, so the latest-stats rows (which carry
+        # ip and custom_name) are all this needs from the miners table
+        latest_by_ip = _latest_stats_snapshot(self.db)
         efficiency_data = []
         total_w_per_th = 0
         valid_miners = 0
 
-        for miner in miners:
-            latest = execute_db_query(
-                self.db,
-                """
-                SELECT s.hashrate, s.power
-                FROM stats s
-                JOIN miners m ON s.miner_id = m.id
-                WHERE m.ip = ?
-                ORDER BY s.timestamp DESC
-                LIMIT 1
-                """,
-                (miner["ip"],),
-            )
-
-            if not latest or not latest[0][0]:
+        for latest in latest_by_ip.values():
+            if not latest["hashrate"]:
                 continue
 
-            hashrate_hs, power_w = latest[0]
+            hashrate_hs, power_w = latest["hashrate"], latest["power"]
             hashrate_th = hashrate_hs / 1e12 if hashrate_hs else 0
 
             if hashrate_th > 0:
@@ -331,8 +397,8 @@ class PowerEfficiencyMatrix:
                 hashrate_gh = hashrate_hs / 1e9
 
                 efficiency_data.append({
-                    "ip": miner["ip"],
-                    "custom_name": miner.get("custom_name", "Unknown"),
+                    "ip": latest["ip"],
+                    "custom_name": latest["custom_name"],
                     "hashrate_th": round(hashrate_th, 2),
                     "power_w": round(power_w, 0),
                     "w_per_th": round(w_per_th, 3),
@@ -447,7 +513,7 @@ class PoolPerformanceComparator:
                     "shares_rejected": int(total_shares_rej or 0),
                     "reject_rate_percent": round(reject_rate, 2),
                     "pool_fee_percent": avg_fee or 0.0,
-                    "estimated_daily_sats": int(total_shares_acc * 992 if total_shares_acc else 0),
+                    "estimated_daily_sats": int(total_shares_acc * SATS_PER_SHARE if total_shares_acc else 0),
                     "efficiency_score": max(0, 100 - (reject_rate * 2)),  # Simple scoring
                 }
 
@@ -472,6 +538,7 @@ class PredictiveRevenueModel:
     def __init__(self, db: Database, btc_fetcher=None):
         self.db = db
         self.btc_fetcher = btc_fetcher
+        self._results = _StatsResultCache(db)
 
     def get_revenue_projection(
         self, target_sats: int = None, electricity_rate: float = 0.12
@@ -501,6 +568,13 @@ class PredictiveRevenueModel:
                 'profitability_status': 'profitable' | 'marginal' | 'unprofitable'
             }
         """
+        return self._results.get_or_compute(
+            ('revenue_projection', target_sats, electricity_rate),
+            lambda: self._compute_revenue_projection(target_sats, electricity_rate),
+        )
+
+    def _compute_revenue_projection(self, target_sats: Optional[int], electricity_rate: float) -> Dict:
+        """Project earnings from the last hour of stats behind get_revenue_projection"""
         # Get current fleet stats
         latest_stats = execute_db_query(
             self.db,
@@ -583,3 +657,4 @@ class PredictiveRevenueModel:
             }
 
         return result
+
@@ -5,12 +5,33 @@ import socket
 import json
 import logging
 import re
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Set, Tuple
 from .base import MinerAPIHandler
 import config
 
+try:
+    import orjson  # Optional: faster parsing of large CGMiner responses
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Encoded requests for the commands sent on every poll
+_COMMAND_REQUESTS = {
+    command: json.dumps({"command": command}).encode()
+    for command in ('version', 'summary', 'devs', 'stats', 'pools', 'summary+devs', 'summary+devs+version')
+}
+
+# Avalon MM ID stats fields, e.g. "OTemp[56] TMax[97] TAvg[89] Fan1[2040] FanR[41%]"
+_RE_TAVG = re.compile(r'TAvg\[(\d+)\]')
+_RE_TMAX = re.compile(r'TMax\[(\d+)\]')
+_RE_OTEMP = re.compile(r'OTemp\[(\d+)\]')
+_RE_FAN1 = re.compile(r'Fan1\[(\d+)\]')
+_RE_FANR = re.compile(r'FanR\[(\d+)%\]')
+_RE_CORE = re.compile(r'Core\[([^\]]+)\]')
+_RE_PS = re.compile(r'PS\[(\d+)\s+(\d+)\s+(\d+)')
+_RE_VER = re.compile(r'Ver\[([^\]]+)\]')
+
 
 class CGMinerAPIHandler(MinerAPIHandler):
     """Handler for CGMiner-based miners (Antminer, Whatsminer, Avalon)"""
@@ -18,6 +39,15 @@ class CGMinerAPIHandler(MinerAPIHandler):
     def __init__(self):
         self.timeout = config.CGMINER_API_TIMEOUT
         self.port = config.CGMINER_PORT
+        # 'version' response per IP; the model doesn't change while a miner stays up
+        self._version_cache: Dict[str, Dict] = {}
+        # IPs whose firmware didn't answer a joined command; they get one request per command
+        self._joined_unsupported: Set[str] = set()
+
+    def invalidate(self, ip: str):
+        """Forget what is cached for a miner so the next poll fetches it again"""
+        self._version_cache.pop(ip, None)
+        self._joined_unsupported.discard(ip)
 
     def _parse_avalon_stats(self, stats_str: str) -> Optional[Dict]:
         """
@@ -31,38 +61,38 @@ class CGMinerAPIHandler(MinerAPIHandler):
             result = {}
 
             # Temperature - use TAvg (average chip temp) as main temp
-            if match := re.search(r'TAvg\[(\d+)\]', stats_str):
+            if match := _RE_TAVG.search(stats_str):
                 result['temp'] = int(match.group(1))
 
             # Max temperature
-            if match := re.search(r'TMax\[(\d+)\]', stats_str):
+            if match := _RE_TMAX.search(stats_str):
                 result['temp_max'] = int(match.group(1))
 
             # Outer/operating temperature as backup
             if 'temp' not in result:
-                if match := re.search(r'OTemp\[(\d+)\]', stats_str):
+                if match := _RE_OTEMP.search(stats_str):
                     result['temp'] = int(match.group(1))
 
             # Fan RPM
-            if match := re.search(r'Fan1\[(\d+)\]', stats_str):
+            if match := _RE_FAN1.search(stats_str):
                 result['fan_rpm'] = int(match.group(1))
 
             # Fan percentage
-            if match := re.search(r'FanR\[(\d+)%\]', stats_str):
+            if match := _RE_FANR.search(stats_str):
                 result['fan_percent'] = int(match.group(1))
 
             # Chip type/core
-            if match := re.search(r'Core\[([^\]]+)\]', stats_str):
+            if match := _RE_CORE.search(stats_str):
                 result['chip_type'] = match.group(1)
 
             # Power - PS field format: PS[v1 v2 power v4 v5 v6 v7]
             # The third value appears to be power in milliwatts
-            if match := re.search(r'PS\[(\d+)\s+(\d+)\s+(\d+)', stats_str):
+            if match := _RE_PS.search(stats_str):
                 power_mw = int(match.group(3))
                 result['power'] = power_mw / 1000.0  # Convert to watts
 
             # Model/Version
-            if match := re.search(r'Ver\[([^\]]+)\]', stats_str):
+            if match := _RE_VER.search(stats_str):
                 model_str = match.group(1)
                 # Extract just the model name (e.g., "Nano3s" from "Nano3s-25021401_56abae7")
                 if '-' in model_str:
@@ -73,72 +103,138 @@ class CGMinerAPIHandler(MinerAPIHandler):
             return result if result else None
 
         except Exception as e:
-            logger.debug(f"Error parsing Avalon stats: {e}")
+            logger.debug("Error parsing Avalon stats: %s", e)
             return None
 
-    def _send_command(self, ip: str, command: str) -> Dict:
-        """Send command to CGMiner API"""
-        sock = None
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            sock.connect((ip, self.port))
-
-            # CGMiner expects JSON command
-            request = json.dumps({"command": command})
-            sock.sendall(request.encode())
+    def _send_command(self, ip: str, command: str, quiet: bool = False) -> Dict:
+        """
+        Send command to CGMiner API
 
-            # Receive response
-            response = b''
-            while True:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
+        Args:
+            quiet: Log failures at debug level, for probes of IPs that may not
+                run CGMiner at all
 
-            # Parse response (strip null bytes that some miners append)
-            response_str = response.decode().rstrip('\x00')
-            return json.loads(response_str)
+        Returns:
+            The parsed response, or a dict with 'error'; connection failures and
+            timeouts also set 'unreachable'
+        """
+        try:
+            # CGMiner expects JSON command
+            request = _COMMAND_REQUESTS.get(command) or json.dumps({"command": command}).encode()
+
+            sock = socket.create_connection((ip, self.port), timeout=self.timeout)
+            with sock:
+                sock.sendall(request)
+
+                # Receive response; bytearray grows in place rather than copying
+                # the whole response on every chunk
+                response = bytearray()
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    response += chunk
+
+            # Parse response (strip null bytes that some miners append);
+            # json.loads decodes the UTF-8 bytes itself
+            response = response.rstrip(b'\x00')
+            if orjson:
+                try:
+                    return orjson.loads(response)
+                except orjson.JSONDecodeError:
+                    pass  # e.g. NaN values, which only the stdlib parser accepts
+            return json.loads(response)
 
         except socket.timeout:
-            logger.warning(f"Timeout sending command '{command}' to {ip}")
-            return {'error': 'timeout'}
+            if quiet:
+                logger.debug("Timeout sending command '%s' to %s", command, ip)
+            else:
+                logger.warning(f"Timeout sending command '{command}' to {ip}")
+            return {'error': 'timeout', 'unreachable': True}
+        except OSError as e:
+            if quiet:
+                logger.debug("Error sending command '%s' to %s: %s", command, ip, e)
+            else:
+                logger.error(f"Error sending command '{command}' to {ip}: {e}")
+            return {'error': str(e), 'unreachable': True}
         except Exception as e:
-            logger.error(f"Error sending command '{command}' to {ip}: {e}")
+            if quiet:
+                logger.debug("Error sending command '%s' to %s: %s", command, ip, e)
+            else:
+                logger.error(f"Error sending command '{command}' to {ip}: {e}")
             return {'error': str(e)}
-        finally:
-            if sock:
-                try:
-                    sock.close()
-                except Exception:
-                    pass
 
-    def detect(self, ip: str) -> bool:
-        """Check if this is a CGMiner-based miner"""
+    def _send_commands(self, ip: str, commands: Tuple[str, ...]) -> Dict[str, Dict]:
+        """
+        Send several commands in one CGMiner API request.
+
+        CGMiner accepts commands joined with '+' and answers with one key per
+        command, each holding that command's usual response in a list. Older
+        firmware that rejects the joined form, or answers it with something
+        unreadable, gets one request per command from then on.
+
+        Returns:
+            Dict of command -> response, as _send_command would return it
+        """
+        if ip not in self._joined_unsupported:
+            result = self._send_command(ip, '+'.join(commands))
+
+            # Separate requests would fail the same way
+            if result.get('unreachable'):
+                return {command: result for command in commands}
+
+            if all(isinstance(result.get(command), list) and result[command] for command in commands):
+                return {command: result[command][0] for command in commands}
+
+            self._joined_unsupported.add(ip)
+
+        return {command: self._send_command(ip, command) for command in commands}
+
+    def detect(self, ip: str) -> Optional[Dict]:
+        """
+        Check if this is a CGMiner-based miner
+
+        Returns:
+            The 'version' response (truthy) if detected, None otherwise, so
+            callers can pass it on to get_status() instead of asking again
+        """
         try:
-            result = self._send_command(ip, 'version')
+            # Most probed IPs refuse the connection or don't answer; that's
+            # expected during discovery, not an error
+            result = self._send_command(ip, 'version', quiet=True)
             # CGMiner response has STATUS and version info
             if 'STATUS' in result or 'VERSION' in result:
-                return True
+                return result
         except Exception as e:
-            logger.debug(f"CGMiner detection failed for {ip}: {e}")
-        return False
+            logger.debug("CGMiner detection failed for %s: %s", ip, e)
+        return None
+
+    def get_status(self, ip: str, version: Optional[Dict] = None) -> Dict:
+        """
+        Get status from CGMiner API
 
-    def get_status(self, ip: str) -> Dict:
-        """Get status from CGMiner API"""
+        Args:
+            ip: Miner IP address
+            version: 'version' response already fetched (e.g. by detect()), if any;
+                otherwise the one cached from an earlier poll is used
+        """
         try:
-            # Get summary for overall stats
-            summary = self._send_command(ip, 'summary')
+            version = version or self._version_cache.get(ip)
+
+            # Summary for overall stats, devs for temperature, version for the model
+            commands = ('summary', 'devs') if version else ('summary', 'devs', 'version')
+            responses = self._send_commands(ip, commands)
+            summary = responses['summary']
 
             if 'error' in summary:
+                self.invalidate(ip)
                 return {'status': 'offline', 'error': summary['error']}
 
             # Parse CGMiner summary response
             if 'SUMMARY' in summary:
                 data = summary['SUMMARY'][0] if summary['SUMMARY'] else {}
 
-                # Get device details for temperature
-                devs = self._send_command(ip, 'devs')
+                devs = responses['devs']
                 temp = 0
                 fan_speed = 0
                 chip_type = None
@@ -150,11 +246,13 @@ class CGMinerAPIHandler(MinerAPIHandler):
                     fan_speed = dev.get('Fan Speed In', 0)
 
                 # Detect miner model from version
-                version = self._send_command(ip, 'version')
+                if not version:
+                    version = responses['version']
                 model = 'CGMiner'
                 is_avalon = False
 
                 if 'VERSION' in version and version['VERSION']:
+                    self._version_cache[ip] = version
                     version_data = version['VERSION'][0]
                     desc = version_data.get('Description', '')
                     prod = version_data.get('PROD', '')
@@ -189,7 +287,7 @@ class CGMinerAPIHandler(MinerAPIHandler):
                                             model = avalon_data['model']
                                     break
                     except Exception as e:
-                        logger.debug(f"Could not parse Avalon stats for {ip}: {e}")
+                        logger.debug("Could not parse Avalon stats for %s: %s", ip, e)
 
                 # Convert MHS to H/s
                 hashrate_mhs = data.get('MHS av', 0)
@@ -208,11 +306,14 @@ class CGMinerAPIHandler(MinerAPIHandler):
                     'best_difficulty': float(data.get('Best Share', 0)),
                     'session_difficulty': float(data.get('Best Share', 0)),  # CGMiner only tracks since boot
                     'uptime_seconds': int(data.get('Elapsed', 0)),
-                    'raw': {
+                }
+
+                # Full responses are retained in Miner.last_status, so only keep them when asked
+                if config.INCLUDE_RAW_MINER_RESPONSES:
+                    result['raw'] = {
                         'summary': summary,
                         'devs': devs
                     }
-                }
 
                 # Add chip type if available (for Avalon miners)
                 if chip_type:
@@ -244,16 +345,13 @@ class CGMinerAPIHandler(MinerAPIHandler):
             pools = []
             active_pool = 0
 
-            for pool in pool_list:
-                url = pool.get('URL', '')
-                user = pool.get('User', '')
-                # Track which pool is active (Status: "Alive" + Stratum Active)
-                if pool.get('Stratum Active', False) or pool.get('Status') == 'Alive':
-                    if pool.get('Stratum Active', False):
-                        active_pool = len(pools)
+            for index, pool in enumerate(pool_list):
+                # Track which pool is active (the one with Stratum Active)
+                if pool.get('Stratum Active', False):
+                    active_pool = index
                 pools.append({
-                    'url': url,
-                    'user': user,
+                    'url': pool.get('URL', ''),
+                    'user': pool.get('User', ''),
                     'password': 'x'
                 })
 
@@ -267,6 +365,7 @@ class CGMinerAPIHandler(MinerAPIHandler):
 
     def restart(self, ip: str) -> bool:
         """Restart CGMiner"""
+        self.invalidate(ip)
         try:
             result = self._send_command(ip, 'restart')
             if 'error' not in result:
@@ -2,6 +2,7 @@
 Miner detection and management
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from typing import Optional, Dict
 from .base import MinerAPIHandler
 from .bitaxe import BitaxeAPIHandler
@@ -10,6 +11,10 @@ import config
 
 logger = logging.getLogger(__name__)
 
+# ESP-Miner devices usually answer well within this, so the CGMiner probe only
+# starts for IPs whose ESP-Miner check fails or is still waiting
+ESP_MINER_HEAD_START = 0.5  # seconds
+
 
 class Miner:
     """Represents a single miner with its API handler"""
@@ -54,6 +59,32 @@ class MinerDetector:
     def __init__(self):
         self.esp_miner_handler = BitaxeAPIHandler()
         self.cgminer_handler = CGMinerAPIHandler()
+        # Runs the ESP-Miner check while the calling thread decides whether to
+        # probe CGMiner too; sized for a full parallel network scan, with
+        # threads started only as needed
+        self._probe_pool = ThreadPoolExecutor(
+            max_workers=config.DISCOVERY_THREADS, thread_name_prefix='esp-miner-probe'
+        )
+
+    def shutdown(self):
+        """Stop the probe threads; pending probes are dropped"""
+        self._probe_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _detect_esp_miner(self, ip: str):
+        """ESP-Miner detect_type() result for ip, or None if it fails"""
+        try:
+            return self.esp_miner_handler.detect_type(ip)
+        except Exception as e:
+            logger.debug("ESP-Miner detection error at %s: %s", ip, e)
+            return None
+
+    def _detect_cgminer(self, ip: str):
+        """CGMinerAPIHandler.detect() result for ip, or None if it fails"""
+        try:
+            return self.cgminer_handler.detect(ip)
+        except Exception as e:
+            logger.debug("CGMiner detection error at %s: %s", ip, e)
+            return None
 
     def detect(self, ip: str) -> Optional[Miner]:
         """
@@ -65,11 +96,21 @@ class MinerDetector:
         Returns:
             Miner instance if detected, None otherwise
         """
-        logger.debug(f"Detecting miner at {ip}")
+        logger.debug("Detecting miner at %s", ip)
+
+        # Try ESP-Miner devices first (BitAxe, NerdQAxe, etc.) - fastest API.
+        # If it hasn't answered within the head start, probe CGMiner while it
+        # finishes, so an IP with neither costs one timeout rather than two;
+        # ESP-Miner still wins if both answer
+        esp_probe = self._probe_pool.submit(self._detect_esp_miner, ip)
+        try:
+            result = esp_probe.result(timeout=ESP_MINER_HEAD_START)
+            version = None if result else self._detect_cgminer(ip)
+        except TimeoutError:
+            version = self._detect_cgminer(ip)
+            result = esp_probe.result()
 
-        # Try ESP-Miner devices first (BitAxe, NerdQAxe, etc.) - fastest API
         try:
-            result = self.esp_miner_handler.detect_type(ip)
             if result:
                 type_key, display_name, raw_data = result
                 logger.info(f"Detected {display_name} at {ip}")
@@ -81,13 +122,14 @@ class MinerDetector:
                 miner.update_status()
                 return miner
         except Exception as e:
-            logger.debug(f"ESP-Miner detection error at {ip}: {e}")
+            logger.debug("ESP-Miner detection error at %s: %s", ip, e)
 
         # Try CGMiner-based devices (Antminer, Whatsminer, Avalon)
         try:
-            if self.cgminer_handler.detect(ip):
-                # Get initial status to determine specific miner type
-                status = self.cgminer_handler.get_status(ip)
+            if version:
+                # Get initial status to determine specific miner type, reusing
+                # the detection response instead of asking for the version again
+                status = self.cgminer_handler.get_status(ip, version=version)
                 if status and status.get('status') == 'online':
                     # Use the detected model as the miner type
                     miner_type = status.get('model', config.MINER_TYPES['ANTMINER'])
@@ -99,9 +141,9 @@ class MinerDetector:
                         miner.model = status['model']
                     return miner
         except Exception as e:
-            logger.debug(f"CGMiner detection error at {ip}: {e}")
+            logger.debug("CGMiner detection error at %s: %s", ip, e)
 
-        logger.debug(f"No miner detected at {ip}")
+        logger.debug("No miner detected at %s", ip)
         return None
 
     def scan_network(self, subnet: str = "10.0.0.0/24") -> list:
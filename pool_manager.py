@@ -3,11 +3,48 @@ Pool Manager - Detects and manages pool configurations for miners
 """
 import logging
 import re
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
 
+import config
+
 logger = logging.getLogger(__name__)
 
+# Current block subsidy (3.125 BTC as of 2024 halving)
+BLOCK_REWARD_SATS = 312_500_000
+
+# Pool URL parsing: "stratum+tcp://host:port", bare "host:port", and the host part alone
+_STRATUM_URL_RX = re.compile(r'(stratum\+tcp|stratum\+ssl|stratum)://([^:]+):(\d+)')
+_HOSTPORT_RX = re.compile(r'([^:]+):(\d+)')
+_HOSTNAME_RX = re.compile(r'://([^:/]+)')
+
+
+def _unanchored(pattern: str) -> str:
+    """
+    Drop a leading/trailing '.*' from a pattern used with re.search.
+
+    They can match the empty string, so they never change whether search()
+    finds a match, but a leading '.*' makes every miss quadratic in the URL
+    length and hides the literal prefix re uses to skip ahead.
+    """
+    if pattern.startswith('.*'):
+        pattern = pattern[2:]
+    if pattern.endswith('.*') and not pattern.endswith('\\.*'):
+        pattern = pattern[:-2]
+    return pattern
+
+
+_LITERAL_PATTERN_RE = re.compile(r'(?:[a-z0-9:\-]|\\\.)+')
+
+
+def _literal(pattern: str) -> Optional[str]:
+    """The text a pattern matches if it is a plain lowercase domain (only '\\.' escapes), else None"""
+    if _LITERAL_PATTERN_RE.fullmatch(pattern):
+        return pattern.replace('\\.', '.')
+    return None
+
 
 class PoolManager:
     """Manage pool configurations and detect pool settings from miners"""
@@ -272,6 +309,44 @@ class PoolManager:
         },
     }
 
+    # (pool_name, literal, compiled pattern, pool_config) in POOL_PATTERNS order,
+    # built once; literal is set for patterns that are just an escaped domain
+    _COMPILED_PATTERNS = [
+        (pool_name, _literal(_unanchored(pattern)), re.compile(_unanchored(pattern), re.IGNORECASE), pool_config)
+        for pool_name, pool_config in POOL_PATTERNS.items()
+        for pattern in pool_config['url_patterns']
+    ]
+
+    # detect_pool_from_url() result for each known pool
+    _KNOWN_POOL_RESULTS = {
+        pool_name: {
+            'pool_name': pool_name,
+            'fee_percent': pool_config['fee_percent'],
+            'pool_type': pool_config['pool_type'],
+            'default_port': pool_config['default_port'],
+            'is_known': True
+        }
+        for pool_name, pool_config in POOL_PATTERNS.items()
+    }
+
+    # Upper-cased pool_type -> (method, confidence or None to keep the computed one, notes)
+    _PAYOUT_METHODS = {
+        # PPLNS/Proportional: Variance-based, depends on pool luck
+        'PPLNS': ('pplns_expected_value', 50,
+                  'PPLNS has high variance. Actual earnings depend on pool luck. Fee: {fee}%'),
+        'PROP': ('pplns_expected_value', 50,
+                 'PPLNS has high variance. Actual earnings depend on pool luck. Fee: {fee}%'),
+        # Full Pay Per Share (Plus): Most predictable. FPPS+ pools already include
+        # tx fees in their payout structure, so no extra multiplier is added
+        'FPPS+': ('fpps_calculation', None, '{pool_type} pool. Fee: {fee}%. Tx fees included in payout.'),
+        'FPPS': ('fpps_calculation', None, '{pool_type} pool. Fee: {fee}%. Tx fees included in payout.'),
+        # Pay Per Share: Standard calculation
+        'PPS': ('pps_calculation', None, 'PPS pool. Fee: {fee}%. Block subsidy only (no tx fees).'),
+        # Ocean's TIDES: Transparent Index of Distinct Extended Shares
+        # Similar to FPPS+ but with Bitcoin Core template
+        'TIDES': ('tides_calculation', None, 'TIDES pool. Fee: {fee}%. Uses Bitcoin Core templates.'),
+    }
+
     def __init__(self, db, miners_dict: Dict):
         """
         Initialize pool manager
@@ -283,6 +358,26 @@ class PoolManager:
         self.db = db
         self.miners = miners_dict
 
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _match_known_pool(url_lower: str) -> Optional[str]:
+        """
+        Name of the first known pool whose pattern matches a lowercased URL.
+
+        Cached because a fleet usually points many miners at the same few URLs.
+        """
+        # Most patterns are plain domains, matched with a substring test. The regex
+        # still handles non-ASCII URLs, where IGNORECASE folds characters lower() keeps.
+        is_ascii = url_lower.isascii()
+        for pool_name, literal, pattern, _ in PoolManager._COMPILED_PATTERNS:
+            if literal and is_ascii:
+                found = literal in url_lower
+            else:
+                found = pattern.search(url_lower)
+            if found:
+                return pool_name
+        return None
+
     def detect_pool_from_url(self, pool_url: str, allow_unknown: bool = True) -> Optional[Dict]:
         """
         Detect pool name and configuration from URL
@@ -297,20 +392,10 @@ class PoolManager:
         if not pool_url:
             return None
 
-        # Normalize URL for pattern matching
-        url_lower = pool_url.lower()
-
-        # Try to match known pools
-        for pool_name, pool_config in self.POOL_PATTERNS.items():
-            for pattern in pool_config['url_patterns']:
-                if re.search(pattern, url_lower, re.IGNORECASE):
-                    return {
-                        'pool_name': pool_name,
-                        'fee_percent': pool_config['fee_percent'],
-                        'pool_type': pool_config['pool_type'],
-                        'default_port': pool_config['default_port'],
-                        'is_known': True
-                    }
+        # Try to match known pools; copy so callers can't alter the shared result
+        pool_name = self._match_known_pool(pool_url.lower())
+        if pool_name:
+            return self._KNOWN_POOL_RESULTS[pool_name].copy()
 
         # Unknown pool - return conservative defaults if allowed
         if allow_unknown:
@@ -318,7 +403,7 @@ class PoolManager:
             hostname = pool_url
             try:
                 # Try to extract just the hostname
-                match = re.search(r'://([^:/]+)', pool_url)
+                match = _HOSTNAME_RX.search(pool_url)
                 if match:
                     hostname = match.group(1)
             except:
@@ -349,7 +434,7 @@ class PoolManager:
             Dict with host, port, protocol
         """
         # Parse stratum+tcp://host:port or similar formats
-        match = re.match(r'(stratum\+tcp|stratum\+ssl|stratum)://([^:]+):(\d+)', pool_url)
+        match = _STRATUM_URL_RX.match(pool_url)
 
         if match:
             protocol, host, port = match.groups()
@@ -361,7 +446,7 @@ class PoolManager:
             }
 
         # Try without protocol
-        match = re.match(r'([^:]+):(\d+)', pool_url)
+        match = _HOSTPORT_RX.match(pool_url)
         if match:
             host, port = match.groups()
             return {
@@ -390,17 +475,23 @@ class PoolManager:
         pools_detected = 0
         pools_updated = 0
 
-        for miner_ip, miner in self.miners.items():
+        # One read for every miner's existing configs instead of one per miner
+        existing_keys = {(cfg['miner_ip'], cfg.get('pool_index', 0)) for cfg in self.db.get_pool_config()}
+
+        # Ask all miners for their pools at once; database writes stay on this thread
+        miners = list(self.miners.items())
+        pool_infos = self._map_miners(self._get_miner_pool_info, [miner for _, miner in miners])
+
+        for (miner_ip, miner), pool_info in zip(miners, pool_infos):
             try:
-                # Get pool information from miner
-                pool_info = self._get_miner_pool_info(miner)
 
                 if not pool_info:
                     logger.debug(f"No pool info available for {miner_ip}")
                     continue
 
-                existing_configs = self.db.get_pool_config(miner_ip=miner_ip)
-                existing_by_index = {cfg.get('pool_index', 0): cfg for cfg in existing_configs}
+                # (config, already existed) per pool, saved together below
+                miner_configs = []
+                miner_keys = set()
 
                 # Process each pool (primary + failovers)
                 for pool_data in pool_info:
@@ -411,7 +502,7 @@ class PoolManager:
                         continue
 
                     # Check if this specific pool index already exists
-                    existing = existing_by_index.get(pool_index)
+                    existing = (miner_ip, pool_index) in existing_keys or pool_index in miner_keys
                     if existing and not force_update:
                         logger.debug(f"Pool config already exists for {miner_ip} index {pool_index}, skipping")
                         continue
@@ -427,28 +518,33 @@ class PoolManager:
                     # Get best difficulty from miner stats (for share calculation)
                     pool_difficulty = pool_data.get('difficulty')
 
-                    # Save to database
-                    self.db.add_pool_config(
-                        miner_ip=miner_ip,
-                        pool_index=pool_index,
-                        pool_name=pool_config['pool_name'],
-                        pool_url=url_info['url'],
-                        pool_port=url_info['port'],
-                        stratum_user=pool_data.get('user', ''),
-                        stratum_password=pool_data.get('password', 'x'),
-                        fee_percent=pool_config['fee_percent'],
-                        pool_type=pool_config['pool_type'],
-                        pool_difficulty=pool_difficulty
-                    )
-
-                    existing_by_index[pool_index] = {'pool_index': pool_index}
+                    miner_configs.append(({
+                        'miner_ip': miner_ip,
+                        'pool_index': pool_index,
+                        'pool_name': pool_config['pool_name'],
+                        'pool_url': url_info['url'],
+                        'pool_port': url_info['port'],
+                        'stratum_user': pool_data.get('user', ''),
+                        'stratum_password': pool_data.get('password', 'x'),
+                        'fee_percent': pool_config['fee_percent'],
+                        'pool_type': pool_config['pool_type'],
+                        'pool_difficulty': pool_difficulty
+                    }, existing))
+                    miner_keys.add(pool_index)
+
+                if not miner_configs:
+                    continue
 
+                # Save to database in one transaction per miner
+                self.db.add_pool_configs([cfg for cfg, _ in miner_configs])
+
+                for cfg, existing in miner_configs:
                     if existing:
                         pools_updated += 1
-                        logger.info(f"Updated pool config: {miner_ip} -> {pool_config['pool_name']}")
+                        logger.info(f"Updated pool config: {miner_ip} -> {cfg['pool_name']}")
                     else:
                         pools_detected += 1
-                        logger.info(f"Detected new pool: {miner_ip} -> {pool_config['pool_name']}")
+                        logger.info(f"Detected new pool: {miner_ip} -> {cfg['pool_name']}")
 
             except Exception as e:
                 logger.error(f"Error detecting pool for {miner_ip}: {e}")
@@ -456,6 +552,14 @@ class PoolManager:
         logger.info(f"Pool detection complete: {pools_detected} new, {pools_updated} updated")
         return {'detected': pools_detected, 'updated': pools_updated}
 
+    def _map_miners(self, fn: Callable, miners: List) -> List:
+        """Call fn(miner) for each miner in parallel (miner API calls are network-bound), results in order"""
+        if not miners:
+            return []
+        max_workers = max(1, min(len(miners), config.DISCOVERY_THREADS))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fn, miners))
+
     def _get_miner_pool_info(self, miner) -> Optional[List[Dict]]:
         """
         Get pool information from a miner instance via its API handler
@@ -493,17 +597,32 @@ class PoolManager:
             logger.error(f"Error getting pool info from miner {getattr(miner, 'ip', '?')}: {e}")
             return None
 
+    def _get_miner_status(self, miner) -> Optional[Dict]:
+        """Last polled status of a miner, polling it now if it has none yet"""
+        try:
+            stats = getattr(miner, 'last_status', None)
+            if not stats and hasattr(miner, 'update_status'):
+                stats = miner.update_status()
+            return stats
+        except Exception as e:
+            logger.error(f"Error updating pool difficulty for {getattr(miner, 'ip', '?')}: {e}")
+            return None
+
     def update_pool_difficulties(self):
         """Update pool difficulties from current miner stats"""
         logger.debug("Updating pool difficulties from miner stats...")
         updated = 0
 
-        for miner_ip, miner in self.miners.items():
-            try:
-                stats = getattr(miner, 'last_status', None)
-                if not stats and hasattr(miner, 'update_status'):
-                    stats = miner.update_status()
+        miners = list(self.miners.items())
+        statuses = self._map_miners(self._get_miner_status, [miner for _, miner in miners])
+
+        configs_by_ip: Dict[str, List[Dict]] = {}
+        for cfg in self.db.get_pool_config():
+            configs_by_ip.setdefault(cfg['miner_ip'], []).append(cfg)
+        updates = []
 
+        for (miner_ip, miner), stats in zip(miners, statuses):
+            try:
                 if stats:
                     # Get best difficulty from miner status payload
                     best_diff = stats.get('best_difficulty', stats.get('best_share'))
@@ -513,19 +632,23 @@ class PoolManager:
                         best_diff_val = 0.0
 
                     if best_diff and best_diff_val > 0:
-                        # Update all pool configs for this miner
-                        pool_configs = self.db.get_pool_config(miner_ip=miner_ip)
-                        for pool in pool_configs:
-                            self.db.update_pool_difficulty(
-                                miner_ip=miner_ip,
-                                pool_index=pool['pool_index'],
-                                pool_difficulty=best_diff
-                            )
+                        # Update this miner's pool configs that don't have it stored yet
+                        for pool in configs_by_ip.get(miner_ip, []):
+                            if pool.get('pool_difficulty') == best_diff_val:
+                                continue
+                            updates.append({
+                                'miner_ip': miner_ip,
+                                'pool_index': pool['pool_index'],
+                                'pool_difficulty': best_diff_val
+                            })
                             updated += 1
 
             except Exception as e:
                 logger.error(f"Error updating pool difficulty for {miner_ip}: {e}")
 
+        if updates:
+            self.db.update_pool_difficulties(updates)
+
         logger.debug(f"Updated {updated} pool difficulty values")
         return updated
 
@@ -542,9 +665,9 @@ class PoolManager:
         configs = self.db.get_pool_config(miner_ip=miner_ip)
         if configs:
             # Return primary pool (index 0)
-            for config in configs:
-                if config['pool_index'] == 0:
-                    return config
+            for cfg in configs:
+                if cfg['pool_index'] == 0:
+                    return cfg
             # Fallback to first pool
             return configs[0]
         return None
@@ -579,10 +702,6 @@ class PoolManager:
                 'notes': 'No shares accepted'
             }
 
-        # Current block subsidy (3.125 BTC as of 2024 halving)
-        block_reward_btc = 3.125
-        block_reward_sats = int(block_reward_btc * 100_000_000)
-
         # Default values if not provided
         if pool_difficulty is None:
             pool_difficulty = 5000  # Typical pool difficulty
@@ -596,8 +715,9 @@ class PoolManager:
             pool_fee_percent = 2.5  # Conservative default
             confidence = min(confidence, 70)
 
-        # Handle different pool types
-        if pool_type and pool_type.upper() == 'SOLO':
+        pool_type_upper = pool_type.upper() if pool_type else ''
+
+        if pool_type_upper == 'SOLO':
             # Solo mining: only get paid if you find a block
             # Shares don't directly translate to sats, need to track blocks found
             return {
@@ -607,77 +727,26 @@ class PoolManager:
                 'notes': 'Solo mining earnings only from blocks found. Use block count instead of shares.'
             }
 
-        elif pool_type and pool_type.upper() in ['PPLNS', 'PROP']:
-            # PPLNS/Proportional: Variance-based, depends on pool luck
-            # Calculate expected value but note high variance
-            shares_per_block = (2**32) * pool_difficulty
-            share_value_sats = block_reward_sats / shares_per_block
-            gross_sats = shares_accepted * share_value_sats
-            net_sats = gross_sats * (1 - pool_fee_percent / 100)
-
-            return {
-                'sats': int(net_sats),
-                'confidence': 50,  # High variance with PPLNS
-                'method': 'pplns_expected_value',
-                'notes': f'PPLNS has high variance. Actual earnings depend on pool luck. Fee: {pool_fee_percent}%'
-            }
-
-        elif pool_type and pool_type.upper() in ['FPPS+', 'FPPS']:
-            # Full Pay Per Share (Plus): Most predictable
-            # FPPS+ includes transaction fees in payout
-            shares_per_block = (2**32) * pool_difficulty
-            share_value_sats = block_reward_sats / shares_per_block
-            gross_sats = shares_accepted * share_value_sats
-            net_sats = gross_sats * (1 - pool_fee_percent / 100)
-
-            # FPPS+ pools already include tx fees in their payout structure
-            # so we don't add extra multiplier
-            return {
-                'sats': int(net_sats),
-                'confidence': confidence,
-                'method': 'fpps_calculation',
-                'notes': f'{pool_type} pool. Fee: {pool_fee_percent}%. Tx fees included in payout.'
-            }
-
-        elif pool_type and pool_type.upper() == 'PPS':
-            # Pay Per Share: Standard calculation
-            shares_per_block = (2**32) * pool_difficulty
-            share_value_sats = block_reward_sats / shares_per_block
-            gross_sats = shares_accepted * share_value_sats
-            net_sats = gross_sats * (1 - pool_fee_percent / 100)
-
-            return {
-                'sats': int(net_sats),
-                'confidence': confidence,
-                'method': 'pps_calculation',
-                'notes': f'PPS pool. Fee: {pool_fee_percent}%. Block subsidy only (no tx fees).'
-            }
-
-        elif pool_type and pool_type.upper() == 'TIDES':
-            # Ocean's TIDES: Transparent Index of Distinct Extended Shares
-            # Similar to FPPS+ but with Bitcoin Core template
-            shares_per_block = (2**32) * pool_difficulty
-            share_value_sats = block_reward_sats / shares_per_block
-            gross_sats = shares_accepted * share_value_sats
-            net_sats = gross_sats * (1 - pool_fee_percent / 100)
-
-            return {
-                'sats': int(net_sats),
-                'confidence': confidence,
-                'method': 'tides_calculation',
-                'notes': f'TIDES pool. Fee: {pool_fee_percent}%. Uses Bitcoin Core templates.'
-            }
+        # Every share-based payout type values a share the same way
+        shares_per_block = (2**32) * pool_difficulty
+        share_value_sats = BLOCK_REWARD_SATS / shares_per_block
+        gross_sats = shares_accepted * share_value_sats
+        net_sats = gross_sats * (1 - pool_fee_percent / 100)
 
-        else:
+        payout = self._PAYOUT_METHODS.get(pool_type_upper)
+        if payout is None:
             # Unknown pool type: use generic PPS calculation
-            shares_per_block = (2**32) * pool_difficulty
-            share_value_sats = block_reward_sats / shares_per_block
-            gross_sats = shares_accepted * share_value_sats
-            net_sats = gross_sats * (1 - pool_fee_percent / 100)
-
             return {
                 'sats': int(net_sats),
                 'confidence': max(50, confidence - 20),
                 'method': 'generic_calculation',
                 'notes': f'Unknown pool type. Using generic calculation. Fee: {pool_fee_percent}%'
             }
+
+        method, payout_confidence, notes = payout
+        return {
+            'sats': int(net_sats),
+            'confidence': confidence if payout_confidence is None else payout_confidence,
+            'method': method,
+            'notes': notes.format(pool_type=pool_type, fee=pool_fee_percent)
+        }
@@ -5,6 +5,7 @@ import unittest
 import os
 import sys
 import tempfile
+from datetime import datetime
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -21,6 +22,7 @@ class TestDatabase(unittest.TestCase):
 
     def tearDown(self):
         """Clean up temporary database"""
+        self.db.close()
         os.close(self.db_fd)
         os.unlink(self.db_path)
 
@@ -72,6 +74,79 @@ class TestDatabase(unittest.TestCase):
         miner = self.db.get_miner_by_ip('10.0.0.100')
         self.assertIsNone(miner)
 
+    def test_bulk_mining_schedules(self):
+        """Test replacing mining schedules in bulk"""
+        self.db.add_mining_schedules([
+            {'start_time': '00:00', 'end_time': '14:00', 'target_frequency': 0},
+            {'start_time': '14:00', 'end_time': '23:59', 'target_frequency': 400},
+        ])
+        self.assertEqual(len(self.db.get_mining_schedules()), 2)
+
+        self.db.delete_active_mining_schedules()
+        self.assertEqual(self.db.get_mining_schedules(), [])
+
+    def test_bulk_pool_configs(self):
+        """Test adding and updating pool configs in bulk"""
+        self.db.add_miner('10.0.0.1', 'BitAxe')
+        self.db.add_miner('10.0.0.2', 'BitAxe')
+        self.db.add_pool_config('10.0.0.1', 0, 'Braiins Pool', 'stratum+tcp://stratum.braiins.com:3333')
+        self.db.add_pool_configs([
+            {'miner_ip': '10.0.0.1', 'pool_index': 0, 'pool_name': 'OCEAN',
+             'pool_url': 'stratum+tcp://mine.ocean.xyz:3334', 'pool_port': 3334},
+            {'miner_ip': '10.0.0.2', 'pool_index': 1, 'pool_name': 'OCEAN',
+             'pool_url': 'stratum+tcp://mine.ocean.xyz:3334', 'pool_port': 3334},
+        ])
+
+        configs = self.db.get_pool_config()
+        self.assertEqual([(c['miner_ip'], c['pool_index'], c['pool_name']) for c in configs],
+                         [('10.0.0.1', 0, 'OCEAN'), ('10.0.0.2', 1, 'OCEAN')])
+        self.assertEqual(configs[0]['pool_port'], 3334)
+
+    def test_historical_rates_batch(self):
+        """Test batch historical rate lookup matches single lookups"""
+        self.db.add_energy_rate('00:00', '12:00', 0.10, rate_type='off-peak')
+        self.db.add_energy_rate('12:00', '23:59', 0.20, rate_type='peak')
+        rate_id = self.db.get_energy_rates()[0]['id']
+        self.db.add_energy_rate_history(rate_id, '2024-01-10', 0.15, 'off-peak', '2024-01-20')
+
+        timestamps = [datetime(2024, 1, 5, 8), datetime(2024, 1, 15, 8), datetime(2024, 1, 15, 18)]
+        rates = self.db.get_historical_rates(timestamps)
+        for ts in timestamps:
+            self.assertEqual(rates[ts]['rate_per_kwh'], self.db.get_historical_rate(ts)['rate_per_kwh'])
+        self.assertEqual(rates[timestamps[1]]['rate_per_kwh'], 0.15)
+
+    def test_latest_stats_by_ip(self):
+        """Test latest stats lookup for all miners"""
+        miner_id = self.db.add_miner('10.0.0.1', 'BitAxe')
+        self.db.add_miner('10.0.0.2', 'BitAxe')
+        self.db.add_stats(miner_id, hashrate=500.0, timestamp=datetime(2024, 1, 1, 12, 5))
+        self.db.add_stats(miner_id, hashrate=400.0, timestamp=datetime(2024, 1, 1, 12, 0))
+
+        latest = self.db.get_latest_stats_by_ip()
+        self.assertEqual(list(latest), ['10.0.0.1'])
+        self.assertEqual(latest['10.0.0.1']['hashrate'], 500.0)
+        self.assertIn('custom_name', latest['10.0.0.1'])
+
+    def test_connection_reuse(self):
+        """Test connections are returned to the pool after use"""
+        self.db.close()
+        self.db.get_all_miners()
+        self.db.get_all_miners()
+        self.assertEqual(self.db._pool.qsize(), 1)
+
+    def test_share_totals_trigger(self):
+        """Test per-miner share range is maintained on stats insert"""
+        miner_id = self.db.add_miner('10.0.0.1', 'BitAxe')
+        for shares in (120, 100, 180):
+            self.db.add_stats(miner_id, shares_accepted=shares)
+
+        with self.db._get_connection(readonly=True) as conn:
+            row = conn.execute(
+                "SELECT min_shares, max_shares FROM miner_share_totals WHERE miner_id = ?",
+                (miner_id,)
+            ).fetchone()
+        self.assertEqual(tuple(row), (100, 180))
+
 
 if __name__ == '__main__':
     unittest.main()
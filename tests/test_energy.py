@@ -0,0 +1,126 @@
+"""
+Unit tests for energy rate lookups
+"""
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import Database
+from energy import EnergyRateManager, MiningScheduler, ProfitabilityCalculator
+
+
+class TestEnergyRateManager(unittest.TestCase):
+    """Test time-of-use rate lookups"""
+
+    def setUp(self):
+        """Create temporary database with a rate manager"""
+        self.db_fd, self.db_path = tempfile.mkstemp()
+        self.db = Database(self.db_path)
+        self.rate_mgr = EnergyRateManager(self.db)
+
+    def tearDown(self):
+        """Clean up temporary database"""
+        self.db.close()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def test_default_rate_without_schedule(self):
+        """Test fallback to configured default rate"""
+        self.db.set_energy_config('Test', 'Test Co', default_rate=0.2)
+        self.rate_mgr.invalidate_cache()
+
+        info = self.rate_mgr.get_rate_info_for_hour(10, 'Monday')
+        self.assertEqual(info['rate'], 0.2)
+        self.assertEqual(info['source'], 'default')
+
+    def test_hourly_rates(self):
+        """Test rates resolved per hour of day"""
+        self.rate_mgr.set_tou_rates([
+            {'start_time': '00:00', 'end_time': '14:00', 'rate_per_kwh': 0.09, 'rate_type': 'off-peak'},
+            {'start_time': '14:00', 'end_time': '19:00', 'rate_per_kwh': 0.17, 'rate_type': 'peak'},
+            {'start_time': '19:00', 'end_time': '23:59', 'rate_per_kwh': 0.09, 'rate_type': 'off-peak'},
+        ])
+
+        rates = self.rate_mgr.get_24h_rates('Tuesday')
+        self.assertEqual(len(rates), 24)
+        self.assertEqual(rates[13]['rate'], 0.09)
+        self.assertEqual(rates[14]['rate_type'], 'peak')
+        self.assertEqual(rates[23]['rate'], 0.09)
+        self.assertEqual(self.rate_mgr.get_rate_for_timestamp(datetime(2024, 1, 2, 18, 59)), 0.17)
+
+    def test_sub_hour_rate_boundary(self):
+        """Test rates that change partway through an hour"""
+        self.rate_mgr.set_tou_rates([
+            {'start_time': '00:00', 'end_time': '14:30', 'rate_per_kwh': 0.10, 'rate_type': 'off-peak'},
+            {'start_time': '14:30', 'end_time': '23:59', 'rate_per_kwh': 0.20, 'rate_type': 'peak'},
+        ])
+
+        self.assertEqual(self.rate_mgr.get_rate_for_timestamp(datetime(2024, 1, 1, 14, 15)), 0.10)
+        self.assertEqual(self.rate_mgr.get_rate_for_timestamp(datetime(2024, 1, 1, 14, 45)), 0.20)
+
+    def test_day_specific_rate(self):
+        """Test rates limited to a day of week"""
+        self.rate_mgr.set_tou_rates([
+            {'start_time': '00:00', 'end_time': '23:59', 'rate_per_kwh': 0.05,
+             'rate_type': 'off-peak', 'day_of_week': 'Saturday'},
+        ])
+
+        self.assertEqual(self.rate_mgr.get_rate_info_for_hour(12, 'Saturday')['rate'], 0.05)
+        self.assertEqual(self.rate_mgr.get_rate_info_for_hour(12, 'Monday')['source'], 'default')
+
+
+class TestProjectedDailyCost(unittest.TestCase):
+    """Test projected daily energy cost"""
+
+    def setUp(self):
+        """Create temporary database with TOU rates"""
+        self.db_fd, self.db_path = tempfile.mkstemp()
+        self.db = Database(self.db_path)
+        self.rate_mgr = EnergyRateManager(self.db)
+        self.rate_mgr.set_tou_rates([
+            {'start_time': '00:00', 'end_time': '14:00', 'rate_per_kwh': 0.09, 'rate_type': 'off-peak'},
+            {'start_time': '14:00', 'end_time': '23:59', 'rate_per_kwh': 0.17, 'rate_type': 'peak'},
+        ])
+        self.scheduler = MiningScheduler(self.db, self.rate_mgr)
+        self.calc = ProfitabilityCalculator(None)
+
+    def tearDown(self):
+        """Clean up temporary database"""
+        self.db.close()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def test_all_off_day_matches_hourly_breakdown(self):
+        """Test the scheduled-off shortcut returns what the hourly loop would"""
+        self.db.add_mining_schedules([
+            {'start_time': '00:00', 'end_time': '23:59', 'target_frequency': 0},
+        ])
+
+        result = self.calc.calculate_projected_daily_cost(100, self.rate_mgr, self.scheduler,
+                                                          day_of_week='Monday')
+        expected = self.calc._daily_cost_breakdown(
+            'Monday', 100, self.scheduler.get_24h_schedule('Monday'),
+            self.rate_mgr.get_24h_rates('Monday'), 600)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(result['hours_off'], 24)
+        self.assertEqual(result['rates_by_type']['peak'], 0.17)
+        self.assertEqual(len(result['hourly_breakdown']), 24)
+
+    def test_zero_power_without_schedule(self):
+        """Test a fleet drawing no power still reports its hours and rates"""
+        result = self.calc.calculate_projected_daily_cost(0, self.rate_mgr, self.scheduler,
+                                                          day_of_week='Monday')
+
+        self.assertEqual(result['total_cost'], 0)
+        self.assertEqual(result['hours_full_power'], 24)
+        self.assertEqual(result['rates_by_type']['off-peak'], 0.09)
+        self.assertEqual(len(result['hourly_breakdown']), 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
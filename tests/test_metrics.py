@@ -0,0 +1,153 @@
+"""
+Unit tests for dashboard metrics
+"""
+import unittest
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import Database
+from metrics import (
+    _StatsResultCache,
+    MinerHealthMonitor,
+    PowerEfficiencyMatrix,
+    PredictiveRevenueModel,
+    SatsEarnedTracker,
+)
+
+
+class TestMetrics(unittest.TestCase):
+    """Test metrics computed from the stats table"""
+
+    def setUp(self):
+        """Create temporary database with one miner's stats"""
+        self.db_fd, self.db_path = tempfile.mkstemp()
+        self.db = Database(self.db_path)
+        self.miner_id = self.db.add_miner('10.0.0.1', 'BitAxe')
+        self.db.add_stats(self.miner_id, hashrate=1e12, temperature=55.0, power=15.0, shares_accepted=10)
+
+    def tearDown(self):
+        """Clean up temporary database"""
+        self.db.close()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def test_result_cache_hit(self):
+        """Test a cached result is reused while no stats are written"""
+        cache = _StatsResultCache(self.db)
+        compute = mock.Mock(side_effect=[1, 2])
+
+        self.assertEqual(cache.get_or_compute('key', compute), 1)
+        self.assertEqual(cache.get_or_compute('key', compute), 1)
+        self.assertEqual(compute.call_count, 1)
+
+    def test_result_cache_miss_after_new_stats(self):
+        """Test a new stats row invalidates cached results"""
+        cache = _StatsResultCache(self.db)
+        compute = mock.Mock(side_effect=[1, 2])
+
+        cache.get_or_compute('key', compute)
+        self.db.add_stats(self.miner_id, shares_accepted=20)
+        self.assertEqual(cache.get_or_compute('key', compute), 2)
+
+    def test_result_cache_miss_after_ttl(self):
+        """Test cached results expire after the TTL"""
+        cache = _StatsResultCache(self.db, ttl=30)
+        compute = mock.Mock(side_effect=[1, 2])
+
+        with mock.patch('metrics.time.monotonic', side_effect=[100.0, 129.0, 131.0]):
+            cache.get_or_compute('key', compute)
+            self.assertEqual(cache.get_or_compute('key', compute), 1)
+            self.assertEqual(cache.get_or_compute('key', compute), 2)
+
+    def test_result_cache_is_bounded(self):
+        """Test distinct keys don't grow the cache past max_entries"""
+        cache = _StatsResultCache(self.db, max_entries=4)
+        for rate in range(100):
+            cache.get_or_compute(('efficiency_matrix', rate), lambda: rate)
+
+        self.assertEqual(len(cache._entries), 4)
+        self.assertIn(('efficiency_matrix', 99), cache._entries)
+
+    def test_result_cache_drops_stale_entries(self):
+        """Test entries from before a new stats row are dropped on write"""
+        cache = _StatsResultCache(self.db)
+        cache.get_or_compute('old', lambda: 1)
+        self.db.add_stats(self.miner_id, shares_accepted=20)
+        cache.get_or_compute('new', lambda: 2)
+
+        self.assertEqual(list(cache._entries), ['new'])
+
+    def test_result_cache_check_skips_write_lock(self):
+        """Test the freshness check doesn't wait for the database write lock"""
+        cache = _StatsResultCache(self.db)
+        cache.get_or_compute('key', lambda: 1)
+
+        with self.db._write_lock:
+            reader = threading.Thread(target=cache.get_or_compute, args=('key', lambda: 2))
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+
+    def test_metrics_getters_read_concurrently(self):
+        """Test metrics getters on separate request threads hold database connections at the same time"""
+        getters = {
+            'sats_earned': SatsEarnedTracker(self.db).get_sats_earned,
+            'fleet_health': MinerHealthMonitor(self.db).get_fleet_health,
+            'efficiency': PowerEfficiencyMatrix(self.db).get_efficiency_matrix,
+            'revenue_projection': PredictiveRevenueModel(self.db).get_revenue_projection,
+        }
+        # Each getter's first connection waits until all of them hold one;
+        # if they were serialized the barrier would time out
+        barrier = threading.Barrier(len(getters), timeout=5)
+        waited = threading.local()
+        get_connection = self.db._get_connection
+
+        @contextmanager
+        def held_connection(readonly=False):
+            with get_connection(readonly=readonly) as conn:
+                if not getattr(waited, 'done', False):
+                    waited.done = True
+                    barrier.wait()
+                yield conn
+
+        results = {}
+
+        def run(key, getter):
+            results[key] = getter()
+
+        with mock.patch.object(self.db, '_get_connection', held_connection):
+            threads = [threading.Thread(target=run, args=item) for item in getters.items()]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=10)
+
+        self.assertFalse(barrier.broken)
+        self.assertEqual(set(results), set(getters))
+        for key, result in results.items():
+            self.assertNotIn('error', result, key)
+
+    def test_hourly_sats_chart_boundaries(self):
+        """Test hour buckets include both boundaries and count NULL shares as zero"""
+        for hour, minute, shares in ((10, 0, 100), (11, 0, 130), (11, 30, None), (12, 0, 150)):
+            self.db.add_stats(self.miner_id, shares_accepted=shares,
+                              timestamp=datetime(2024, 1, 1, hour, minute))
+
+        chart = SatsEarnedTracker(self.db)._get_hourly_sats_chart(datetime(2024, 1, 1, 12, 0))
+
+        self.assertEqual(len(chart), 24)
+        self.assertEqual(chart[-1]['timestamp'], '2024-01-01T11:00:00')
+        # 11:00 row is in both 10:00 and 11:00 buckets, 10:00 row alone gives no delta
+        self.assertEqual([c['sats'] for c in chart[-3:]], [0, 30 * 992, 150 * 992])
+        self.assertTrue(all(c['sats'] == 0 for c in chart[:-2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
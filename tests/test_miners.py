@@ -6,6 +6,8 @@ from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
 import json
+import logging
+import threading
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -102,9 +104,54 @@ class TestCGMinerAPIHandler(unittest.TestCase):
         ]
         mock_socket.return_value = mock_sock
 
-        # Mock multiple commands
+        # Mock one joined summary+devs+version command
+        with patch.object(self.handler, '_send_command') as mock_send:
+            mock_send.return_value = {
+                'summary': [CGMINER_SUMMARY],
+                'devs': [CGMINER_DEVS],
+                'version': [CGMINER_VERSION],
+            }
+
+            status = self.handler.get_status('10.0.0.101')
+
+            mock_send.assert_called_once_with('10.0.0.101', 'summary+devs+version')
+            self.assertEqual(status['status'], 'online')
+            self.assertEqual(status['hashrate'], 13500000 * 1000000)
+            self.assertEqual(status['temperature'], 65.0)
+            self.assertEqual(status['model'], 'Antminer')
+
+    def test_get_status_reuses_version(self):
+        """Test that a version response from detection is not fetched again"""
+        with patch.object(self.handler, '_send_command') as mock_send:
+            mock_send.return_value = {
+                'summary': [CGMINER_SUMMARY],
+                'devs': [CGMINER_DEVS],
+            }
+
+            status = self.handler.get_status('10.0.0.101', version=CGMINER_VERSION)
+
+            mock_send.assert_called_once_with('10.0.0.101', 'summary+devs')
+            self.assertEqual(status['model'], 'Antminer')
+
+    def test_get_status_caches_version(self):
+        """Test that later polls skip the version command"""
+        with patch.object(self.handler, '_send_command') as mock_send:
+            mock_send.side_effect = [
+                {'summary': [CGMINER_SUMMARY], 'devs': [CGMINER_DEVS], 'version': [CGMINER_VERSION]},
+                {'summary': [CGMINER_SUMMARY], 'devs': [CGMINER_DEVS]},
+            ]
+
+            self.handler.get_status('10.0.0.101')
+            status = self.handler.get_status('10.0.0.101')
+
+            mock_send.assert_called_with('10.0.0.101', 'summary+devs')
+            self.assertEqual(status['model'], 'Antminer')
+
+    def test_get_status_without_joined_commands(self):
+        """Test falling back to one command per request on older firmware"""
         with patch.object(self.handler, '_send_command') as mock_send:
             mock_send.side_effect = [
+                {'STATUS': [{'STATUS': 'E', 'Msg': 'Invalid command'}]},
                 CGMINER_SUMMARY,
                 CGMINER_DEVS,
                 CGMINER_VERSION
@@ -112,11 +159,57 @@ class TestCGMinerAPIHandler(unittest.TestCase):
 
             status = self.handler.get_status('10.0.0.101')
 
+            self.assertEqual(mock_send.call_count, 4)
             self.assertEqual(status['status'], 'online')
-            self.assertEqual(status['hashrate'], 13500000 * 1000000)
-            self.assertEqual(status['temperature'], 65.0)
             self.assertEqual(status['model'], 'Antminer')
 
+    def test_get_status_remembers_joined_failure(self):
+        """Test an unreadable joined response falls back and isn't retried"""
+        with patch.object(self.handler, '_send_command') as mock_send:
+            mock_send.side_effect = [
+                {'error': 'Expecting value: line 1 column 1 (char 0)'},
+                CGMINER_SUMMARY,
+                CGMINER_DEVS,
+                CGMINER_VERSION,
+                CGMINER_SUMMARY,
+                CGMINER_DEVS,
+            ]
+
+            self.handler.get_status('10.0.0.101')
+            status = self.handler.get_status('10.0.0.101')
+
+            self.assertEqual(mock_send.call_count, 6)
+            mock_send.assert_called_with('10.0.0.101', 'devs')
+            self.assertEqual(status['status'], 'online')
+
+    def test_get_status_unreachable(self):
+        """Test a refused connection doesn't retry each command"""
+        with patch.object(self.handler, '_send_command') as mock_send:
+            mock_send.return_value = {'error': 'Connection refused', 'unreachable': True}
+
+            status = self.handler.get_status('10.0.0.101')
+
+            mock_send.assert_called_once_with('10.0.0.101', 'summary+devs+version')
+            self.assertEqual(status['status'], 'offline')
+
+    def test_parse_avalon_stats(self):
+        """Test parsing Avalon MM ID stats string"""
+        stats = ("Ver[Nano3s-25021401_56abae7] Core[A3197S] OTemp[56] TMax[97] TAvg[89] "
+                 "Fan1[2040] FanR[41%] PS[0 0 27535 4 0 3626 129]")
+        result = self.handler._parse_avalon_stats(stats)
+
+        self.assertEqual(result, {
+            'temp': 89,
+            'temp_max': 97,
+            'fan_rpm': 2040,
+            'fan_percent': 41,
+            'chip_type': 'A3197S',
+            'power': 27.535,
+            'model': 'Nano3s',
+        })
+        self.assertEqual(self.handler._parse_avalon_stats("OTemp[56]"), {'temp': 56})
+        self.assertIsNone(self.handler._parse_avalon_stats("Elapsed[100]"))
+
 
 class TestMinerDetector(unittest.TestCase):
     """Test miner detector"""
@@ -142,6 +235,47 @@ class TestMinerDetector(unittest.TestCase):
         self.assertEqual(miner.ip, '10.0.0.100')
         self.assertIn('bitaxe', miner.type.lower())
 
+    @patch('miners.cgminer.socket.create_connection')
+    @patch('miners.bitaxe.BitaxeAPIHandler.detect_type')
+    @patch('miners.bitaxe.BitaxeAPIHandler.get_status')
+    def test_detect_bitaxe_quiet_cgminer_probe(self, mock_status, mock_detect_type, mock_connect):
+        """Test the background CGMiner probe of an ESP-Miner doesn't log errors"""
+        probed = threading.Event()
+
+        def refuse(*args, **kwargs):
+            probed.set()
+            raise ConnectionRefusedError(111, 'Connection refused')
+
+        def detect_type(ip):
+            # Answer only once the CGMiner probe has been refused
+            probed.wait(timeout=5)
+            return ('BITAXE_MAX', 'BitAxe Max', BITAXE_SYSTEM_INFO)
+
+        mock_connect.side_effect = refuse
+        mock_detect_type.side_effect = detect_type
+        mock_status.return_value = {'status': 'online', 'model': 'BitAxe Max'}
+
+        with self.assertLogs('miners', level='DEBUG') as logs:
+            miner = self.detector.detect('10.0.0.100')
+            self.detector._probe_pool.shutdown(wait=True)
+
+        self.assertIs(miner.api_handler, self.detector.esp_miner_handler)
+        self.assertTrue(probed.is_set())
+        self.assertEqual([r for r in logs.records if r.levelno >= logging.WARNING], [])
+
+    @patch('miners.cgminer.CGMinerAPIHandler.detect')
+    @patch('miners.bitaxe.BitaxeAPIHandler.detect_type')
+    @patch('miners.bitaxe.BitaxeAPIHandler.get_status')
+    def test_detect_bitaxe_skips_cgminer_probe(self, mock_status, mock_detect_type, mock_cgminer):
+        """Test an ESP-Miner answering within the head start gets no CGMiner probe"""
+        mock_detect_type.return_value = ('BITAXE_MAX', 'BitAxe Max', BITAXE_SYSTEM_INFO)
+        mock_status.return_value = {'status': 'online', 'model': 'BitAxe Max'}
+
+        miner = self.detector.detect('10.0.0.100')
+
+        self.assertIs(miner.api_handler, self.detector.esp_miner_handler)
+        mock_cgminer.assert_not_called()
+
     @patch('miners.bitaxe.BitaxeAPIHandler.detect')
     @patch('miners.cgminer.CGMinerAPIHandler.detect')
     def test_detect_no_miner(self, mock_cgminer, mock_bitaxe):
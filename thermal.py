@@ -5,7 +5,10 @@ Intelligent temperature-based frequency optimization for Bitcoin miners.
 Prevents overheating while maximizing hashrate through real-time adjustments.
 """
 import logging
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import config
@@ -13,9 +16,9 @@ import config
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FrequencyProfile:
-    """Frequency and temperature profile for a miner type"""
+    """Frequency and temperature profile for a miner type (shared by every miner of that type)"""
     min_freq: int          # Minimum safe frequency (MHz)
     max_freq: int          # Maximum safe frequency (MHz)
     stock_freq: int        # Factory default frequency (MHz) - applied on connect/reboot
@@ -295,14 +298,29 @@ MINER_PROFILES = {
 }
 
 
+@lru_cache(maxsize=64)
+def _resolve_profile(miner_type: str) -> FrequencyProfile:
+    """Get the frequency profile for a miner type (cached; the key lookup is a chain of substring tests)"""
+    # Use config helper to map detailed type to thermal profile key
+    profile_key = config.get_thermal_profile_key(miner_type)
+    return MINER_PROFILES.get(profile_key, MINER_PROFILES['Unknown'])
+
+
 class ThermalState:
     """Track thermal state of a miner"""
+    __slots__ = (
+        'miner_ip', 'miner_type', 'profile',
+        'current_freq', 'current_temp', 'last_temp', 'temp_trend',
+        'current_fan_speed', 'min_fan_speed', 'max_fan_speed', 'fan_step',
+        'in_emergency_cooldown', 'cooldown_started', 'cooldown_duration',
+        'auto_tune_enabled', 'last_adjustment', 'adjustment_interval',
+        'hashrate_history', 'temp_history',
+    )
+
     def __init__(self, miner_ip: str, miner_type: str):
         self.miner_ip = miner_ip
         self.miner_type = miner_type
-        # Use config helper to map detailed type to thermal profile key
-        profile_key = config.get_thermal_profile_key(miner_type)
-        self.profile = MINER_PROFILES.get(profile_key, MINER_PROFILES['Unknown'])
+        self.profile = _resolve_profile(miner_type)
 
         self.current_freq = self.profile.stock_freq
         self.current_temp = 0.0
@@ -315,26 +333,26 @@ class ThermalState:
         self.max_fan_speed = 100  # Maximum fan speed
         self.fan_step = 10  # Fan speed adjustment step
 
-        # Emergency shutdown tracking
+        # Emergency shutdown tracking (times are time.monotonic() seconds)
         self.in_emergency_cooldown = False
         self.cooldown_started = None
-        self.cooldown_duration = timedelta(minutes=10)
+        self.cooldown_duration = 600.0  # 10 minutes
 
         # Auto-tuning state
         self.auto_tune_enabled = True
         self.last_adjustment = None
-        self.adjustment_interval = timedelta(seconds=30)  # Don't adjust too frequently
+        self.adjustment_interval = 30.0  # Don't adjust too frequently
 
-        # Performance tracking
-        self.hashrate_history = []
-        self.temp_history = []
+        # Performance tracking, oldest first: (monotonic time, hashrate, freq, temp) and (monotonic time, temp, freq)
+        self.hashrate_history = deque()
+        self.temp_history = deque()
 
     def update_fan_speed(self, fan_speed: int):
         """Update current fan speed"""
         self.current_fan_speed = fan_speed
 
-    def update_temperature(self, temp: float):
-        """Update current temperature and calculate trend"""
+    def update_temperature(self, temp: float, now: Optional[float] = None):
+        """Update current temperature and calculate trend (now: time.monotonic(), if already read)"""
         self.last_temp = self.current_temp
         self.current_temp = temp
 
@@ -343,35 +361,32 @@ class ThermalState:
             self.temp_trend = temp - self.last_temp
 
         # Track history
-        self.temp_history.append({
-            'timestamp': datetime.now(),
-            'temp': temp,
-            'freq': self.current_freq
-        })
+        if now is None:
+            now = time.monotonic()
+        self.temp_history.append((now, temp, self.current_freq))
 
         # Keep only last hour of history
-        cutoff = datetime.now() - timedelta(hours=1)
-        self.temp_history = [h for h in self.temp_history if h['timestamp'] > cutoff]
+        cutoff = now - 3600
+        while self.temp_history[0][0] <= cutoff:
+            self.temp_history.popleft()
 
-    def update_hashrate(self, hashrate: float):
+    def update_hashrate(self, hashrate: float, now: Optional[float] = None):
         """Track hashrate for performance optimization"""
-        self.hashrate_history.append({
-            'timestamp': datetime.now(),
-            'hashrate': hashrate,
-            'freq': self.current_freq,
-            'temp': self.current_temp
-        })
+        if now is None:
+            now = time.monotonic()
+        self.hashrate_history.append((now, hashrate, self.current_freq, self.current_temp))
 
         # Keep only last hour
-        cutoff = datetime.now() - timedelta(hours=1)
-        self.hashrate_history = [h for h in self.hashrate_history if h['timestamp'] > cutoff]
+        cutoff = now - 3600
+        while self.hashrate_history[0][0] <= cutoff:
+            self.hashrate_history.popleft()
 
-    def check_emergency_cooldown(self) -> bool:
+    def check_emergency_cooldown(self, now: Optional[float] = None) -> bool:
         """Check if miner is in emergency cooldown period"""
         if not self.in_emergency_cooldown:
             return False
 
-        elapsed = datetime.now() - self.cooldown_started
+        elapsed = (time.monotonic() if now is None else now) - self.cooldown_started
         if elapsed >= self.cooldown_duration:
             # Cooldown complete
             self.in_emergency_cooldown = False
@@ -379,25 +394,25 @@ class ThermalState:
             logger.info(f"Emergency cooldown complete for {self.miner_ip}")
             return False
 
-        remaining = (self.cooldown_duration - elapsed).total_seconds()
-        logger.debug(f"{self.miner_ip} cooling down, {remaining:.0f}s remaining")
+        remaining = self.cooldown_duration - elapsed
+        logger.debug("%s cooling down, %.0fs remaining", self.miner_ip, remaining)
         return True
 
-    def trigger_emergency_shutdown(self):
+    def trigger_emergency_shutdown(self, now: Optional[float] = None):
         """Trigger emergency shutdown and cooldown"""
         logger.warning(f"EMERGENCY SHUTDOWN triggered for {self.miner_ip} " +
                       f"(temp: {self.current_temp:.1f}°C, critical: {self.profile.critical_temp}°C)")
 
         self.in_emergency_cooldown = True
-        self.cooldown_started = datetime.now()
+        self.cooldown_started = time.monotonic() if now is None else now
         self.current_freq = 0  # Shut down completely
 
-    def can_adjust_frequency(self) -> bool:
+    def can_adjust_frequency(self, now: Optional[float] = None) -> bool:
         """Check if enough time has passed since last adjustment"""
         if self.last_adjustment is None:
             return True
 
-        elapsed = datetime.now() - self.last_adjustment
+        elapsed = (time.monotonic() if now is None else now) - self.last_adjustment
         return elapsed >= self.adjustment_interval
 
     def get_average_temp(self, minutes: int = 5) -> Optional[float]:
@@ -405,8 +420,16 @@ class ThermalState:
         if not self.temp_history:
             return None
 
-        cutoff = datetime.now() - timedelta(minutes=minutes)
-        recent = [h['temp'] for h in self.temp_history if h['timestamp'] > cutoff]
+        # Walk back from the newest entry until the window ends. The monitor
+        # thread appends/pops the deque in place while API threads read it, so
+        # iterate a copy (list() of a deque is a single atomic C call)
+        cutoff = time.monotonic() - minutes * 60
+        recent = []
+        for timestamp, temp, _ in reversed(list(self.temp_history)):
+            if timestamp <= cutoff:
+                break
+            recent.append(temp)
+        recent.reverse()
 
         if not recent:
             return None
@@ -434,8 +457,7 @@ class ThermalManager:
 
     def _get_profile(self, miner_type: str) -> FrequencyProfile:
         """Get the frequency profile for a miner type"""
-        profile_key = config.get_thermal_profile_key(miner_type)
-        return MINER_PROFILES.get(profile_key, MINER_PROFILES['Unknown'])
+        return _resolve_profile(miner_type)
 
     def register_miner(self, miner_ip: str, miner_type: str):
         """Register a miner for thermal management"""
@@ -465,10 +487,11 @@ class ThermalManager:
             return
 
         state = self.thermal_states[miner_ip]
-        state.update_temperature(temperature)
+        now = time.monotonic()
+        state.update_temperature(temperature, now)
 
         if hashrate is not None:
-            state.update_hashrate(hashrate)
+            state.update_hashrate(hashrate, now)
 
         # Sync actual miner frequency with thermal state
         # This ensures we don't try to "increase" frequency when already at max
@@ -495,14 +518,15 @@ class ThermalManager:
 
         state = self.thermal_states[miner_ip]
         profile = state.profile
+        now = time.monotonic()
 
         # Check emergency cooldown
-        if state.check_emergency_cooldown():
+        if state.check_emergency_cooldown(now):
             return (0, 100, "Emergency cooldown in progress")
 
         # Check for critical temperature - EMERGENCY SHUTDOWN
         if state.current_temp >= profile.critical_temp:
-            state.trigger_emergency_shutdown()
+            state.trigger_emergency_shutdown(now)
             return (0, 100, f"EMERGENCY: Critical temp {state.current_temp:.1f}°C >= {profile.critical_temp}°C")
 
         # Check if auto-tune is disabled
@@ -510,7 +534,7 @@ class ThermalManager:
             return (state.current_freq, None, "Auto-tune disabled")
 
         # Check if we can adjust (rate limiting)
-        if not state.can_adjust_frequency():
+        if not state.can_adjust_frequency(now):
             return (state.current_freq, None, "Too soon since last adjustment")
 
         current_freq = state.current_freq
@@ -570,7 +594,7 @@ class ThermalManager:
             changed = True
 
         if changed:
-            state.last_adjustment = datetime.now()
+            state.last_adjustment = now
             # Log adjustment to database
             self._log_thermal_adjustment(
                 miner_ip=miner_ip,
@@ -594,10 +618,14 @@ class ThermalManager:
 
     def get_thermal_status(self, miner_ip: str) -> Optional[Dict]:
         """Get current thermal status for a miner"""
-        if miner_ip not in self.thermal_states:
+        state = self.thermal_states.get(miner_ip)
+        if state is None:
             return None
+        return self._thermal_status(miner_ip, state)
 
-        state = self.thermal_states[miner_ip]
+    @staticmethod
+    def _thermal_status(miner_ip: str, state: ThermalState) -> Dict:
+        """Build the thermal status dict for a registered miner"""
         profile = state.profile
 
         return {
@@ -621,8 +649,8 @@ class ThermalManager:
     def get_all_thermal_status(self) -> Dict[str, Dict]:
         """Get thermal status for all miners"""
         return {
-            ip: self.get_thermal_status(ip)
-            for ip in self.thermal_states.keys()
+            ip: self._thermal_status(ip, state)
+            for ip, state in list(self.thermal_states.items())
         }
 
     def set_auto_tune(self, miner_ip: str, enabled: bool):